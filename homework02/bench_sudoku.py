@@ -0,0 +1,94 @@
+import multiprocessing as mp
+import pathlib
+import sys
+import time
+import typing as tp
+
+import sudoku
+import sudoku_numpy
+
+HARD_PUZZLES = pathlib.Path(__file__).parent / "hard_puzzles.txt"
+# Меньше подсказок generate_sudoku(unique=True) за одну попытку надёжно не даёт
+MIN_UNIQUE_CLUES = 21
+
+
+def _solve_all(engine: str, puzzles: tp.List[str], solved: tp.Any) -> None:
+    for puzzle in puzzles:
+        solution = sudoku.solve(sudoku.create_grid(puzzle), engine=engine)
+        assert solution is not None and sudoku.check_solution(solution)
+        with solved.get_lock():
+            solved.value += 1
+
+
+def bench_solve(engine: str, puzzles: tp.List[str], time_limit: float = 30.0) -> tp.Tuple[int, float]:
+    """
+    Решать пазлы движком engine, пока не кончатся пазлы или время. Вернуть
+    (решено, секунд). Пазлы решаются в отдельном процессе, который по
+    истечении time_limit останавливается посреди пазла: один трудный пазл
+    у перебора с возвратом иначе считается минутами.
+    """
+    solved = mp.Value("i", 0)
+    process = mp.Process(target=_solve_all, args=(engine, puzzles, solved), daemon=True)
+    start = time.perf_counter()
+    process.start()
+    process.join(time_limit)
+    elapsed = time.perf_counter() - start
+    if process.is_alive():
+        process.terminate()
+        process.join()
+    elif process.exitcode != 0:
+        raise RuntimeError(f"engine {engine} failed on puzzle {solved.value}")
+    return solved.value, elapsed
+
+
+def bench_generate(clues: int, time_limit: float = 2.0, attempts: int = 1) -> tp.Tuple[int, float]:
+    """
+    Генерировать пазлы с единственным решением и clues подсказками в течение
+    time_limit секунд. Одна попытка generate_sudoku длится до секунды-двух,
+    поэтому по умолчанию attempts=1, чтобы не выходить за time_limit.
+    """
+    generated = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < time_limit:
+        try:
+            sudoku.generate_sudoku(clues, unique=True, attempts=attempts)
+        except ValueError:
+            continue
+        generated += 1
+    return generated, time.perf_counter() - start
+
+
+def bench_check(solutions: tp.List[str], copies: int = 1000) -> tp.Tuple[float, float]:
+    """Секунды на проверку copies * len(solutions) решений по одному и одним массивом"""
+    grids = [sudoku.create_grid(solution) for solution in solutions] * copies
+    start = time.perf_counter()
+    python_ok = [sudoku.check_solution(grid) for grid in grids]
+    python_seconds = time.perf_counter() - start
+
+    array = sudoku_numpy.to_array(solutions * copies)
+    sudoku_numpy.check_solutions(array[:1])
+    start = time.perf_counter()
+    numpy_ok, _ = sudoku_numpy.check_solutions(array)
+    numpy_seconds = time.perf_counter() - start
+    assert python_ok == numpy_ok.tolist()
+    return python_seconds, numpy_seconds
+
+
+if __name__ == "__main__":
+    TIME_LIMIT = float(sys.argv[1]) if len(sys.argv) > 1 else 30.0
+    PUZZLES = [str(grid) for grid in sudoku.read_puzzles(HARD_PUZZLES)]
+    for ENGINE in sudoku.ENGINES:
+        SOLVED, ELAPSED = bench_solve(ENGINE, PUZZLES, TIME_LIMIT)
+        print(f"{ENGINE:>12}: {SOLVED}/{len(PUZZLES)} puzzles in {ELAPSED:.2f}s, {SOLVED / ELAPSED:.2f} puzzles/s")
+    print(f"generate 17-{MIN_UNIQUE_CLUES - 1} clues: skipped, not reliably reachable by clue removal")
+    for CLUES in range(MIN_UNIQUE_CLUES, 41):
+        GENERATED, ELAPSED = bench_generate(CLUES, TIME_LIMIT / 10)
+        print(
+            f"generate {CLUES} clues: {GENERATED} unique puzzles in {ELAPSED:.2f}s, {GENERATED / ELAPSED:.2f} puzzles/s"
+        )
+    SOLUTIONS = [str(sudoku.solve(sudoku.Grid.from_string(puzzle))) for puzzle in PUZZLES]
+    PYTHON_SECONDS, NUMPY_SECONDS = bench_check(SOLUTIONS)
+    CHECKED = 1000 * len(SOLUTIONS)
+    print(
+        f"check_solution: {CHECKED / PYTHON_SECONDS:.0f} grids/s, check_solutions: {CHECKED / NUMPY_SECONDS:.0f} grids/s"
+    )
@@ -0,0 +1,158 @@
+import typing as tp
+
+
+class DancingLinks:
+    """
+    Алгоритм X Кнута для задачи точного покрытия на танцующих ссылках.
+
+    Узлы хранятся в параллельных списках left/right/up/down/column: узел 0 -
+    корень, узлы 1..n_columns - заголовки столбцов, дальше - единицы матрицы.
+    >>> dlx = DancingLinks(3, [[0, 1], [2], [1, 2], [0]])
+    >>> sorted(sorted(s) for s in dlx.solutions())
+    [[0, 1], [2, 3]]
+    >>> dlx.count(limit=1)
+    1
+    """
+
+    def __init__(self, n_columns: int, rows: tp.Iterable[tp.Sequence[int]]) -> None:
+        self.left = list(range(-1, n_columns))
+        self.left[0] = n_columns
+        self.right = list(range(1, n_columns + 1)) + [0]
+        self.up = list(range(n_columns + 1))
+        self.down = list(range(n_columns + 1))
+        self.column = list(range(n_columns + 1))
+        self.size = [0] * (n_columns + 1)
+        self.row_of = [-1] * (n_columns + 1)
+        # Счётчики перебора: выбранные строки, откаты и наибольшая глубина
+        self.nodes = 0
+        self.backtracks = 0
+        self.max_depth = 0
+        # Первый узел каждой строки матрицы
+        self.row_nodes: tp.List[int] = []
+        for row_id, columns in enumerate(rows):
+            first = len(self.column)
+            self.row_nodes.append(first)
+            for i, col in enumerate(columns):
+                node = first + i
+                header = col + 1
+                self.left.append(node - 1 if i else first + len(columns) - 1)
+                self.right.append(node + 1 if i < len(columns) - 1 else first)
+                self.up.append(self.up[header])
+                self.down.append(header)
+                self.down[self.up[header]] = node
+                self.up[header] = node
+                self.column.append(header)
+                self.row_of.append(row_id)
+                self.size[header] += 1
+
+    def _cover(self, c: int) -> None:
+        left, right, up, down, column, size = self.left, self.right, self.up, self.down, self.column, self.size
+        right[left[c]] = right[c]
+        left[right[c]] = left[c]
+        i = down[c]
+        while i != c:
+            j = right[i]
+            while j != i:
+                down[up[j]] = down[j]
+                up[down[j]] = up[j]
+                size[column[j]] -= 1
+                j = right[j]
+            i = down[i]
+
+    def _uncover(self, c: int) -> None:
+        left, right, up, down, column, size = self.left, self.right, self.up, self.down, self.column, self.size
+        i = up[c]
+        while i != c:
+            j = left[i]
+            while j != i:
+                size[column[j]] += 1
+                down[up[j]] = j
+                up[down[j]] = j
+                j = left[j]
+            i = up[i]
+        right[left[c]] = c
+        left[right[c]] = c
+
+    def _cover_row(self, r: int) -> None:
+        j = self.right[r]
+        while j != r:
+            self._cover(self.column[j])
+            j = self.right[j]
+
+    def _uncover_row(self, r: int) -> None:
+        j = self.left[r]
+        while j != r:
+            self._uncover(self.column[j])
+            j = self.left[j]
+
+    def select(self, row_id: int) -> bool:
+        """Заранее включить строку row_id в решение. Вернуть False, если она конфликтует с уже выбранными"""
+        first = self.row_nodes[row_id]
+        node = first
+        while True:
+            c = self.column[node]
+            if self.right[self.left[c]] != c:
+                return False
+            self._cover(c)
+            node = self.right[node]
+            if node == first:
+                return True
+
+    def solutions(self) -> tp.Generator[tp.List[int], None, None]:
+        """Перебрать все точные покрытия (номера строк), выбирая столбец с наименьшим числом единиц"""
+        right, down, column, size = self.right, self.down, self.column, self.size
+        chosen: tp.List[int] = []
+        forward = True
+        try:
+            while True:
+                if forward:
+                    if right[0] == 0:
+                        yield [self.row_of[r] for r in chosen]
+                        forward = False
+                        continue
+                    best, c = right[0], right[right[0]]
+                    while c != 0 and size[best] > 1:
+                        if size[c] < size[best]:
+                            best = c
+                        c = right[c]
+                    if size[best] == 0:
+                        forward = False
+                        continue
+                    self._cover(best)
+                    chosen.append(down[best])
+                    self._cover_row(down[best])
+                    self.nodes += 1
+                    if len(chosen) > self.max_depth:
+                        self.max_depth = len(chosen)
+                else:
+                    if not chosen:
+                        return
+                    r = chosen.pop()
+                    self._uncover_row(r)
+                    self.backtracks += 1
+                    c = column[r]
+                    r = down[r]
+                    if r == c:
+                        self._uncover(c)
+                        continue
+                    chosen.append(r)
+                    self._cover_row(r)
+                    self.nodes += 1
+                    forward = True
+        finally:
+            # Если перебор прервали, вернуть матрицу в исходное состояние
+            while chosen:
+                r = chosen.pop()
+                self._uncover_row(r)
+                self._uncover(column[r])
+
+    def count(self, limit: tp.Optional[int] = None) -> int:
+        """Подсчитать число решений, остановившись на limit"""
+        found = 0
+        solutions = self.solutions()
+        for _ in solutions:
+            found += 1
+            if limit is not None and found >= limit:
+                break
+        solutions.close()
+        return found
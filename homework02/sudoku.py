@@ -1,8 +1,25 @@
+import argparse
+import csv
+import io
+import itertools
+import json
+import math
+import mmap
+import os
 import pathlib
+import random
+import sys
+import time
 import typing as tp
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+
+from dlx import DancingLinks
 
 T = tp.TypeVar("T")
 
+# Символы для полей n^2 x n^2: 4x4 использует "1234", 16x16 - "1"-"9" и "A"-"G", 25x25 - до "P"
+SYMBOLS = "123456789ABCDEFGHIJKLMNOP"
+
 
 def read_sudoku(path: tp.Union[str, pathlib.Path]) -> tp.List[tp.List[str]]:
     """ Прочитать Судоку из указанного файла """
@@ -12,23 +29,28 @@ def read_sudoku(path: tp.Union[str, pathlib.Path]) -> tp.List[tp.List[str]]:
     return create_grid(puzzle)
 
 
-def create_grid(puzzle: str) -> tp.List[tp.List[str]]:
-    digits = [c for c in puzzle if c in "123456789."]
-    grid = group(digits, 9)
+def create_grid(puzzle: tp.Union[str, "Grid"]) -> tp.List[tp.List[str]]:
+    if isinstance(puzzle, Grid):
+        return puzzle.to_lists()
+    digits = [c for c in puzzle if c in SYMBOLS or c == "."]
+    grid = group(digits, math.isqrt(len(digits)) or 9)
     return grid
 
 
 def display(grid: tp.List[tp.List[str]]) -> None:
     """Вывод Судоку """
+    size = len(grid)
+    box = math.isqrt(size)
     width = 2
-    line = "+".join(["-" * (width * 3)] * 3)
-    for row in range(9):
+    line = "+".join(["-" * (width * box)] * box)
+    for row in range(size):
         print(
             "".join(
-                grid[row][col].center(width) + ("|" if str(col) in "25" else "") for col in range(9)
+                grid[row][col].center(width) + ("|" if col % box == box - 1 and col < size - 1 else "")
+                for col in range(size)
             )
         )
-        if str(row) in "25":
+        if row % box == box - 1 and row < size - 1:
             print(line)
     print()
 
@@ -41,10 +63,169 @@ def group(values: tp.List[T], n: int) -> tp.List[tp.List[T]]:
     >>> group([1,2,3,4,5,6,7,8,9], 3)
     [[1, 2, 3], [4, 5, 6], [7, 8, 9]]
     """
-    pass
+    return [values[i : i + n] for i in range(0, len(values), n)]
+
+
+# Номера строки, столбца и квадрата для каждой из 81 клетки, все блоки и соседи клеток
+_ROW_OF = [i // 9 for i in range(81)]
+_COL_OF = [i % 9 for i in range(81)]
+_BLOCK_OF = [3 * (i // 27) + (i % 9) // 3 for i in range(81)]
+_UNITS = (
+    [[9 * r + c for c in range(9)] for r in range(9)]
+    + [[9 * r + c for r in range(9)] for c in range(9)]
+    + [[9 * (3 * (b // 3) + i // 3) + 3 * (b % 3) + i % 3 for i in range(9)] for b in range(9)]
+)
+_PEERS = [tuple(sorted({j for unit in _UNITS if i in unit for j in unit} - {i})) for i in range(81)]
+
+
+class Grid:
+    """Пазл в виде 81 байта (ASCII-символы '1'-'9' и '.') в порядке строк
+    >>> grid = Grid.from_string(".1" * 40 + "9")
+    >>> grid[0, 1], grid[8][8]
+    ('1', '9')
+    >>> Grid.from_lists(grid.to_lists()) == grid
+    True
+    """
+
+    __slots__ = ("cells",)
+
+    def __init__(self, cells: tp.Union[bytes, bytearray]) -> None:
+        if len(cells) != 81:
+            raise ValueError(f"Grid must have 81 cells, got {len(cells)}")
+        self.cells = bytearray(cells)
+
+    @classmethod
+    def from_string(cls, puzzle: str) -> "Grid":
+        cells = puzzle.encode("ascii", "ignore")
+        if len(cells) != 81 or cells.strip(b"123456789."):
+            cells = bytes(c for c in cells if c in b"123456789.")
+        return cls(cells)
+
+    @classmethod
+    def from_lists(cls, grid: tp.List[tp.List[str]]) -> "Grid":
+        return cls("".join(value for row in grid for value in row).encode("ascii"))
+
+    def to_lists(self) -> tp.List[tp.List[str]]:
+        return group(list(self.cells.decode("ascii")), 9)
+
+    def __str__(self) -> str:
+        return self.cells.decode("ascii")
+
+    def __repr__(self) -> str:
+        return f"Grid({str(self)!r})"
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, Grid) and self.cells == other.cells
+
+    def __iter__(self) -> tp.Iterator[tp.List[str]]:
+        return (self.row(r) for r in range(9))
+
+    def __len__(self) -> int:
+        return 9
+
+    @tp.overload
+    def __getitem__(self, key: int) -> tp.List[str]: ...
+
+    @tp.overload
+    def __getitem__(self, key: tp.Tuple[int, int]) -> str: ...
+
+    def __getitem__(self, key: tp.Union[int, tp.Tuple[int, int]]) -> tp.Union[str, tp.List[str]]:
+        if isinstance(key, tuple):
+            return chr(self.cells[9 * key[0] + key[1]])
+        return self.row(key)
+
+    def __setitem__(self, key: tp.Tuple[int, int], value: str) -> None:
+        self.cells[9 * key[0] + key[1]] = ord(value)
+
+    def copy(self) -> "Grid":
+        return Grid(self.cells)
+
+    def row(self, row: int) -> tp.List[str]:
+        return list(self.cells[9 * row : 9 * row + 9].decode("ascii"))
+
+    def col(self, col: int) -> tp.List[str]:
+        return list(self.cells[col::9].decode("ascii"))
+
+    def block(self, pos: tp.Tuple[int, int]) -> tp.List[str]:
+        return [chr(self.cells[i]) for i in _UNITS[18 + _BLOCK_OF[9 * pos[0] + pos[1]]]]
+
+    def peers(self, pos: tp.Tuple[int, int]) -> tp.List[str]:
+        """Значения 20 клеток, стоящих в одной строке, столбце или квадрате с pos"""
+        return [chr(self.cells[i]) for i in _PEERS[9 * pos[0] + pos[1]]]
+
+
+AnyGrid = tp.Union[tp.List[tp.List[str]], Grid]
+
+# Пустые клетки бывают записаны нулём, а разделители строк и квадратов при чтении выбрасываются
+_EMPTY_AS_DOT = bytes.maketrans(b"0", b".")
+_SEPARATORS = b" \t\r\n|+-"
+
+
+def _lines(source: tp.Union[str, pathlib.Path, tp.BinaryIO, tp.TextIO]) -> tp.Iterator[bytes]:
+    """
+    Строки файла или потока в байтах. Обычные файлы отображаются в память
+    целиком, без чтения в буфер; строки текстовых потоков без .buffer
+    (например, io.StringIO) кодируются
+    """
+    if isinstance(source, (str, pathlib.Path)) and str(source) != "-":
+        with open(source, "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                yield from iter(mm.readline, b"")
+        return
+    stream: tp.Any = sys.stdin if str(source) == "-" else source
+    for line in getattr(stream, "buffer", stream):
+        yield line.encode() if isinstance(line, str) else line
 
 
-def get_row(grid: tp.List[tp.List[str]], pos: tp.Tuple[int, int]) -> tp.List[str]:
+def read_puzzles(
+    source: tp.Union[str, pathlib.Path, tp.BinaryIO, tp.TextIO], skipped: tp.Optional[tp.List[int]] = None
+) -> tp.Iterator[Grid]:
+    """Лениво прочитать пазлы из файла, потока или stdin ('-')
+
+    Пазл записывается либо одной строкой из 81 символа (как в hard_puzzles.txt),
+    либо девятью строками по 9 символов (как в puzzle1.txt). Строки без клеток
+    (пустые и разделители) пропускаются. Номера строк, с которых начинаются
+    испорченные записи, добавляются в skipped.
+    >>> grid = next(read_puzzles('puzzle1.txt'))
+    >>> grid.row(0)
+    ['5', '3', '.', '.', '7', '.', '.', '.', '.']
+    >>> skipped = []
+    >>> len(list(read_puzzles(io.BytesIO(b"1" * 81 + b"\\n123\\n" + b"." * 81), skipped))), skipped
+    (2, [2])
+    """
+    block = b""
+    block_start = 0
+    for lineno, line in enumerate(_lines(source), 1):
+        cells = line.translate(_EMPTY_AS_DOT, _SEPARATORS)
+        if not cells:
+            continue
+        if len(cells) not in (9, 81) or cells.translate(None, b"123456789."):
+            if skipped is not None:
+                skipped.append(block_start or lineno)
+            block = b""
+            block_start = 0
+            continue
+        if len(cells) == 81:
+            if block and skipped is not None:
+                skipped.append(block_start)
+            block = b""
+            block_start = 0
+            yield Grid(cells)
+            continue
+        if not block:
+            block_start = lineno
+        block += cells
+        if len(block) == 81:
+            yield Grid(block)
+            block = b""
+            block_start = 0
+    if block and skipped is not None:
+        skipped.append(block_start)
+
+
+def get_row(grid: AnyGrid, pos: tp.Tuple[int, int]) -> tp.List[str]:
     """Возвращает все значения для номера строки, указанной в pos
     >>> get_row([['1', '2', '.'], ['4', '5', '6'], ['7', '8', '9']], (0, 0))
     ['1', '2', '.']
@@ -53,10 +234,12 @@ def get_row(grid: tp.List[tp.List[str]], pos: tp.Tuple[int, int]) -> tp.List[str
     >>> get_row([['1', '2', '3'], ['4', '5', '6'], ['.', '8', '9']], (2, 0))
     ['.', '8', '9']
     """
-    pass
+    if isinstance(grid, Grid):
+        return grid.row(pos[0])
+    return list(grid[pos[0]])
 
 
-def get_col(grid: tp.List[tp.List[str]], pos: tp.Tuple[int, int]) -> tp.List[str]:
+def get_col(grid: AnyGrid, pos: tp.Tuple[int, int]) -> tp.List[str]:
     """Возвращает все значения для номера столбца, указанного в pos
     >>> get_col([['1', '2', '.'], ['4', '5', '6'], ['7', '8', '9']], (0, 0))
     ['1', '4', '7']
@@ -65,10 +248,12 @@ def get_col(grid: tp.List[tp.List[str]], pos: tp.Tuple[int, int]) -> tp.List[str
     >>> get_col([['1', '2', '3'], ['4', '5', '6'], ['.', '8', '9']], (0, 2))
     ['3', '6', '9']
     """
-    pass
+    if isinstance(grid, Grid):
+        return grid.col(pos[1])
+    return [row[pos[1]] for row in grid]
 
 
-def get_block(grid: tp.List[tp.List[str]], pos: tp.Tuple[int, int]) -> tp.List[str]:
+def get_block(grid: AnyGrid, pos: tp.Tuple[int, int]) -> tp.List[str]:
     """Возвращает все значения из квадрата, в который попадает позиция pos
     >>> grid = read_sudoku('puzzle1.txt')
     >>> get_block(grid, (0, 1))
@@ -78,10 +263,14 @@ def get_block(grid: tp.List[tp.List[str]], pos: tp.Tuple[int, int]) -> tp.List[s
     >>> get_block(grid, (8, 8))
     ['2', '8', '.', '.', '.', '5', '.', '7', '9']
     """
-    pass
+    if isinstance(grid, Grid):
+        return grid.block(pos)
+    box = math.isqrt(len(grid))
+    row, col = box * (pos[0] // box), box * (pos[1] // box)
+    return [grid[r][c] for r in range(row, row + box) for c in range(col, col + box)]
 
 
-def find_empty_positions(grid: tp.List[tp.List[str]]) -> tp.Optional[tp.Tuple[int, int]]:
+def find_empty_positions(grid: AnyGrid) -> tp.Optional[tp.Tuple[int, int]]:
     """Найти первую свободную позицию в пазле
     >>> find_empty_positions([['1', '2', '.'], ['4', '5', '6'], ['7', '8', '9']])
     (0, 2)
@@ -90,10 +279,17 @@ def find_empty_positions(grid: tp.List[tp.List[str]]) -> tp.Optional[tp.Tuple[in
     >>> find_empty_positions([['1', '2', '3'], ['4', '5', '6'], ['.', '8', '9']])
     (2, 0)
     """
-    pass
+    if isinstance(grid, Grid):
+        i = grid.cells.find(b".")
+        return None if i == -1 else divmod(i, 9)
+    for row, values in enumerate(grid):
+        for col, value in enumerate(values):
+            if value == ".":
+                return row, col
+    return None
 
 
-def find_possible_values(grid: tp.List[tp.List[str]], pos: tp.Tuple[int, int]) -> tp.Set[str]:
+def find_possible_values(grid: AnyGrid, pos: tp.Tuple[int, int]) -> tp.Set[str]:
     """Вернуть множество возможных значения для указанной позиции
     >>> grid = read_sudoku('puzzle1.txt')
     >>> values = find_possible_values(grid, (0,2))
@@ -103,10 +299,336 @@ def find_possible_values(grid: tp.List[tp.List[str]], pos: tp.Tuple[int, int]) -
     >>> values == {'2', '5', '9'}
     True
     """
-    pass
+    used = set(get_row(grid, pos)) | set(get_col(grid, pos)) | set(get_block(grid, pos))
+    return set(SYMBOLS[: len(grid)]) - used
+
+
+def _backtrack(grid: tp.List[tp.List[str]], counters: tp.Optional[tp.Dict[str, int]], depth: int = 0) -> bool:
+    if counters is not None:
+        counters["nodes"] += 1
+        counters["max_depth"] = max(counters["max_depth"], depth)
+    pos = find_empty_positions(grid)
+    if pos is None:
+        return True
+    row, col = pos
+    for value in sorted(find_possible_values(grid, pos)):
+        grid[row][col] = value
+        if _backtrack(grid, counters, depth + 1):
+            return True
+        if counters is not None:
+            counters["backtracks"] += 1
+    grid[row][col] = "."
+    return False
+
+
+def _solve_backtracking(grid: AnyGrid, counters: tp.Optional[tp.Dict[str, int]] = None) -> tp.Optional[AnyGrid]:
+    """Наивный перебор с возвратом по первой свободной позиции"""
+    lists = grid.to_lists() if isinstance(grid, Grid) else grid
+    if not _backtrack(lists, counters):
+        return None
+    return Grid.from_lists(lists) if isinstance(grid, Grid) else lists
+
+
+# Битовые маски кандидатов: цифра d соответствует биту 1 << (d - 1)
+_ALL_DIGITS = 0x1FF
+
+
+class _BitmaskState:
+    """Состояние поиска: значения клеток и маски занятых цифр в строках, столбцах и квадратах"""
+
+    def __init__(self, cells: tp.Iterable[str]) -> None:
+        self.values = [0] * 81
+        self.rows = [0] * 9
+        self.cols = [0] * 9
+        self.blocks = [0] * 9
+        self.trail: tp.List[int] = []
+        # Число ветвлений перебора, по нему оценивается сложность пазла
+        self.guesses = 0
+        # Счётчики для SolveStats: узлы перебора, откаты, глубина, клетки, заполненные распространением
+        self.nodes = 0
+        self.backtracks = 0
+        self.max_depth = 0
+        self.eliminations = 0
+        for i, value in enumerate(cells):
+            if value != ".":
+                bit = 1 << (int(value) - 1)
+                self.values[i] = bit
+                self.rows[_ROW_OF[i]] |= bit
+                self.cols[_COL_OF[i]] |= bit
+                self.blocks[_BLOCK_OF[i]] |= bit
+
+    def candidates(self, i: int) -> int:
+        return _ALL_DIGITS & ~(self.rows[_ROW_OF[i]] | self.cols[_COL_OF[i]] | self.blocks[_BLOCK_OF[i]])
+
+    def place(self, i: int, bit: int) -> None:
+        self.values[i] = bit
+        self.rows[_ROW_OF[i]] |= bit
+        self.cols[_COL_OF[i]] |= bit
+        self.blocks[_BLOCK_OF[i]] |= bit
+        self.trail.append(i)
+
+    def undo(self, mark: int) -> None:
+        """Откатить все постановки, сделанные после отметки mark"""
+        while len(self.trail) > mark:
+            i = self.trail.pop()
+            bit = self.values[i]
+            self.values[i] = 0
+            self.rows[_ROW_OF[i]] ^= bit
+            self.cols[_COL_OF[i]] ^= bit
+            self.blocks[_BLOCK_OF[i]] ^= bit
+
+    def propagate(self) -> bool:
+        """Расставить голые и скрытые одиночки. Вернуть False при противоречии"""
+        changed = True
+        while changed:
+            changed = False
+            for i in range(81):
+                if self.values[i]:
+                    continue
+                cand = self.candidates(i)
+                if not cand:
+                    return False
+                if not cand & (cand - 1):
+                    self.place(i, cand)
+                    self.eliminations += 1
+                    changed = True
+            for unit in _UNITS:
+                once = twice = used = empty = 0
+                for i in unit:
+                    if self.values[i]:
+                        used |= self.values[i]
+                    else:
+                        cand = self.candidates(i)
+                        twice |= once & cand
+                        once |= cand
+                        empty += 1
+                missing = _ALL_DIGITS & ~used
+                # Если исходные цифры в блоке повторяются, он не обязан содержать все цифры
+                if missing.bit_count() != empty:
+                    continue
+                if missing & ~once:
+                    return False
+                singles = missing & once & ~twice
+                while singles:
+                    bit = singles & -singles
+                    singles ^= bit
+                    cell = next((i for i in unit if not self.values[i] and self.candidates(i) & bit), None)
+                    if cell is None:
+                        return False
+                    self.place(cell, bit)
+                    self.eliminations += 1
+                    changed = True
+        return True
 
+    def choose(self) -> tp.Tuple[int, int]:
+        """Свободная клетка с наименьшим числом кандидатов и её кандидаты, (-1, 0) если свободных нет"""
+        best, best_cand, best_count = -1, 0, 10
+        for i in range(81):
+            if not self.values[i]:
+                cand = self.candidates(i)
+                count = cand.bit_count()
+                if count < best_count:
+                    best, best_cand, best_count = i, cand, count
+                    if count == 2:
+                        break
+        return best, best_cand
 
-def solve(grid: tp.List[tp.List[str]]) -> tp.Optional[tp.List[tp.List[str]]]:
+    def search(self, depth: int = 0) -> bool:
+        self.nodes += 1
+        if depth > self.max_depth:
+            self.max_depth = depth
+        mark = len(self.trail)
+        if not self.propagate():
+            self.undo(mark)
+            return False
+        best, best_cand = self.choose()
+        if best == -1:
+            return True
+        while best_cand:
+            bit = best_cand & -best_cand
+            best_cand ^= bit
+            self.guesses += 1
+            self.place(best, bit)
+            if self.search(depth + 1):
+                return True
+            self.backtracks += 1
+            self.undo(len(self.trail) - 1)
+        self.undo(mark)
+        return False
+
+    def count(self, limit: int) -> int:
+        """Подсчитать решения, но не больше limit. Состояние после подсчёта не меняется"""
+        mark = len(self.trail)
+        if not self.propagate():
+            self.undo(mark)
+            return 0
+        best, best_cand = self.choose()
+        found = 1 if best == -1 else 0
+        while best_cand and found < limit:
+            bit = best_cand & -best_cand
+            best_cand ^= bit
+            self.place(best, bit)
+            found += self.count(limit - found)
+            self.undo(len(self.trail) - 1)
+        self.undo(mark)
+        return found
+
+    def to_string(self) -> str:
+        return "".join(str(bit.bit_length()) if bit else "." for bit in self.values)
+
+    def report(self, counters: tp.Optional[tp.Dict[str, int]]) -> None:
+        if counters is not None:
+            counters.update(
+                nodes=self.nodes, backtracks=self.backtracks, max_depth=self.max_depth, eliminations=self.eliminations
+            )
+
+
+def _solve_bitmask(grid: AnyGrid, counters: tp.Optional[tp.Dict[str, int]] = None) -> tp.Optional[AnyGrid]:
+    """Поиск с распространением ограничений на битовых масках кандидатов"""
+    if isinstance(grid, Grid):
+        state = _BitmaskState(str(grid))
+        solved = state.search()
+        state.report(counters)
+        return Grid.from_string(state.to_string()) if solved else None
+    state = _BitmaskState(value for row in grid for value in row)
+    solved = state.search()
+    state.report(counters)
+    if not solved:
+        return None
+    return group(list(state.to_string()), 9)
+
+
+def _exact_cover(cells: tp.Sequence[str], size: int) -> tp.Optional[DancingLinks]:
+    """Построить матрицу точного покрытия для поля size x size и выбрать в ней исходные цифры
+
+    Строка матрицы (r * size + c) * size + d - цифра d в клетке (r, c). Столбцы:
+    клетка занята, цифра есть в строке, в столбце и в квадрате, по size^2 каждого вида.
+    """
+    box = math.isqrt(size)
+    area = size * size
+    links = DancingLinks(
+        4 * area,
+        (
+            (
+                r * size + c,
+                area + r * size + d,
+                2 * area + c * size + d,
+                3 * area + (box * (r // box) + c // box) * size + d,
+            )
+            for r in range(size)
+            for c in range(size)
+            for d in range(size)
+        ),
+    )
+    for i, value in enumerate(cells):
+        if value == ".":
+            continue
+        d = SYMBOLS.find(value)
+        if not 0 <= d < size or not links.select(i * size + d):
+            return None
+    return links
+
+
+def _solve_dlx(grid: AnyGrid, counters: tp.Optional[tp.Dict[str, int]] = None) -> tp.Optional[AnyGrid]:
+    """Алгоритм X на танцующих ссылках, работает для полей 4x4, 9x9, 16x16, 25x25"""
+    size = len(grid)
+    cells = [value for row in grid for value in row]
+    links = _exact_cover(cells, size)
+    rows = next(links.solutions(), None) if links else None
+    if links and counters is not None:
+        counters.update(nodes=links.nodes, backtracks=links.backtracks, max_depth=links.max_depth)
+    if rows is None:
+        return None
+    for row_id in rows:
+        cell, d = divmod(row_id, size)
+        cells[cell] = SYMBOLS[d]
+    if isinstance(grid, Grid):
+        return Grid.from_string("".join(cells))
+    return group(cells, size)
+
+
+def count_solutions(grid: AnyGrid, limit: tp.Optional[int] = None) -> int:
+    """Подсчитать число решений пазла, но не больше limit
+    >>> count_solutions(create_grid("." * 16))
+    288
+    >>> count_solutions(read_sudoku("puzzle1.txt"), limit=2)
+    1
+    """
+    links = _exact_cover([value for row in grid for value in row], len(grid))
+    return links.count(limit) if links else 0
+
+
+GridT = tp.TypeVar("GridT", tp.List[tp.List[str]], Grid)
+
+
+class SolveStats:
+    """
+    Статистика решения: по записи на пазл с числом узлов перебора, откатов,
+    максимальной глубиной, числом клеток, заполненных распространением
+    ограничений, и временем. Передаётся в solve(grid, stats=...); без неё
+    solve время не замеряет и записи не создаёт.
+    """
+
+    FIELDS = ("engine", "solved", "nodes", "backtracks", "max_depth", "eliminations", "seconds")
+    NUMERIC = ("nodes", "backtracks", "max_depth", "eliminations", "seconds")
+
+    def __init__(self) -> None:
+        self.records: tp.List[tp.Dict[str, tp.Any]] = []
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def add(self, engine: str, solved: bool, seconds: float, counters: tp.Dict[str, int]) -> None:
+        record: tp.Dict[str, tp.Any] = {"engine": engine, "solved": solved, "seconds": seconds}
+        for field in ("nodes", "backtracks", "max_depth", "eliminations"):
+            record[field] = counters.get(field, 0)
+        self.records.append(record)
+
+    def extend(self, other: "SolveStats") -> None:
+        self.records.extend(other.records)
+
+    def histogram(self, field: str, bins: int = 10) -> tp.List[tp.Tuple[float, float, int]]:
+        """Разбить значения field на bins равных интервалов: (начало, конец, число пазлов)"""
+        values = [record[field] for record in self.records]
+        if not values:
+            return []
+        low, high = min(values), max(values)
+        width = (high - low) / bins or 1
+        counts = [0] * bins
+        for value in values:
+            counts[min(int((value - low) / width), bins - 1)] += 1
+        return [(low + i * width, low + (i + 1) * width, count) for i, count in enumerate(counts)]
+
+    def summary(self) -> tp.Dict[str, tp.Dict[str, float]]:
+        result = {}
+        for field in self.NUMERIC:
+            values = [record[field] for record in self.records]
+            if values:
+                result[field] = {"min": min(values), "max": max(values), "mean": sum(values) / len(values)}
+        return result
+
+    def to_json(self, f: tp.TextIO, bins: int = 10) -> None:
+        data = {
+            "summary": self.summary(),
+            "histograms": {field: self.histogram(field, bins) for field in self.NUMERIC},
+            "records": self.records,
+        }
+        json.dump(data, f, indent=2)
+
+    def to_csv(self, f: tp.TextIO) -> None:
+        writer = csv.DictWriter(f, fieldnames=self.FIELDS)
+        writer.writeheader()
+        writer.writerows(self.records)
+
+
+ENGINES: tp.Dict[str, tp.Callable[[AnyGrid, tp.Optional[tp.Dict[str, int]]], tp.Optional[AnyGrid]]] = {
+    "backtracking": _solve_backtracking,
+    "bitmask": _solve_bitmask,
+    "dlx": _solve_dlx,
+}
+
+
+def solve(grid: GridT, engine: tp.Optional[str] = None, stats: tp.Optional[SolveStats] = None) -> tp.Optional[GridT]:
     """ Решение пазла, заданного в grid """
     """ Как решать Судоку?
         1. Найти свободную позицию
@@ -114,21 +636,208 @@ def solve(grid: tp.List[tp.List[str]]) -> tp.Optional[tp.List[tp.List[str]]]:
         3. Для каждого возможного значения:
             3.1. Поместить это значение на эту позицию
             3.2. Продолжить решать оставшуюся часть пазла
+
+    Движок "backtracking" делает ровно это. Движок "bitmask" хранит маски
+    кандидатов строк, столбцов и квадратов, расставляет голые и скрытые
+    одиночки и ветвится по клетке с наименьшим числом кандидатов.
+
+    Движок "dlx" сводит пазл к точному покрытию и решает поля любого
+    размера n^2 x n^2. По умолчанию 9x9 решается движком "bitmask", остальные
+    размеры - движком "dlx". Решение возвращается в том же виде, что и grid:
+    списком списков или Grid. Если передан stats, в него добавляется запись
+    со счётчиками перебора и временем решения.
     >>> grid = read_sudoku('puzzle1.txt')
     >>> solve(grid)
     [['5', '3', '4', '6', '7', '8', '9', '1', '2'], ['6', '7', '2', '1', '9', '5', '3', '4', '8'], ['1', '9', '8', '3', '4', '2', '5', '6', '7'], ['8', '5', '9', '7', '6', '1', '4', '2', '3'], ['4', '2', '6', '8', '5', '3', '7', '9', '1'], ['7', '1', '3', '9', '2', '4', '8', '5', '6'], ['9', '6', '1', '5', '3', '7', '2', '8', '4'], ['2', '8', '7', '4', '1', '9', '6', '3', '5'], ['3', '4', '5', '2', '8', '6', '1', '7', '9']]
     """
-    pass
+    if engine is None:
+        engine = "bitmask" if len(grid) == 9 else "dlx"
+    if stats is None:
+        return tp.cast(tp.Optional[GridT], ENGINES[engine](grid, None))
+    counters: tp.Dict[str, int] = {"nodes": 0, "backtracks": 0, "max_depth": 0}
+    start = time.perf_counter()
+    solution = ENGINES[engine](grid, counters)
+    stats.add(engine, solution is not None, time.perf_counter() - start, counters)
+    return tp.cast(tp.Optional[GridT], solution)
 
 
-def check_solution(solution: tp.List[tp.List[str]]) -> bool:
+def check_solution(solution: AnyGrid) -> bool:
     """ Если решение solution верно, то вернуть True, в противном случае False """
     # TODO: Add doctests with bad puzzles
-    pass
+    size = len(solution)
+    box = math.isqrt(size)
+    digits = set(SYMBOLS[:size])
+    for i in range(size):
+        if set(get_row(solution, (i, 0))) != digits:
+            return False
+        if set(get_col(solution, (0, i))) != digits:
+            return False
+        if set(get_block(solution, (box * (i // box), box * (i % box)))) != digits:
+            return False
+    return True
+
+
+class SudokuBoard:
+    """
+    Поле для интерактивного интерфейса: клетки меняются через place и undo,
+    а счётчики цифр в строках, столбцах и квадратах обновляются на месте,
+    поэтому возможные значения и конфликты не пересчитываются с нуля.
+    Ответ is_solvable кэшируется до следующего изменения поля.
+    >>> board = SudokuBoard(read_sudoku('puzzle1.txt'))
+    >>> sorted(board.possible_values((0, 2)))
+    ['1', '2', '4']
+    >>> board.place((0, 2), '5')
+    >>> board.conflicts((0, 2)), board.has_conflicts, board.is_solvable()
+    (True, True, False)
+    >>> board.undo()
+    >>> board.has_conflicts, board.is_solvable()
+    (False, True)
+    """
+
+    def __init__(self, grid: AnyGrid) -> None:
+        self.size = len(grid)
+        self.box = math.isqrt(self.size)
+        self.cells = [list(row) for row in grid]
+        # Клетки с исходными цифрами менять нельзя
+        self.fixed = {(r, c) for r in range(self.size) for c in range(self.size) if self.cells[r][c] != "."}
+        self.row_counts = [[0] * self.size for _ in range(self.size)]
+        self.col_counts = [[0] * self.size for _ in range(self.size)]
+        self.block_counts = [[0] * self.size for _ in range(self.size)]
+        # Число пар (блок, цифра), где цифра встречается больше одного раза
+        self.duplicates = 0
+        self.history: tp.List[tp.Tuple[tp.Tuple[int, int], str]] = []
+        self._solvable: tp.Optional[bool] = None
+        for r in range(self.size):
+            for c in range(self.size):
+                if self.cells[r][c] != ".":
+                    self._count((r, c), self.cells[r][c], 1)
+
+    def _block(self, pos: tp.Tuple[int, int]) -> int:
+        return self.box * (pos[0] // self.box) + pos[1] // self.box
+
+    def _count(self, pos: tp.Tuple[int, int], value: str, delta: int) -> None:
+        d = SYMBOLS.index(value)
+        for counts in (self.row_counts[pos[0]], self.col_counts[pos[1]], self.block_counts[self._block(pos)]):
+            if delta < 0 and counts[d] == 2:
+                self.duplicates -= 1
+            counts[d] += delta
+            if delta > 0 and counts[d] == 2:
+                self.duplicates += 1
+
+    def _set(self, pos: tp.Tuple[int, int], value: str) -> None:
+        old = self.cells[pos[0]][pos[1]]
+        if old != ".":
+            self._count(pos, old, -1)
+        if value != ".":
+            self._count(pos, value, 1)
+        self.cells[pos[0]][pos[1]] = value
+        self._solvable = None
+
+    def place(self, pos: tp.Tuple[int, int], value: str) -> None:
+        """Поставить цифру value в клетку pos ('.' - стереть)"""
+        if pos in self.fixed:
+            raise ValueError(f"Cell {pos} holds a given digit")
+        if value != "." and value not in SYMBOLS[: self.size]:
+            raise ValueError(f"Unknown digit {value!r}")
+        self.history.append((pos, self.cells[pos[0]][pos[1]]))
+        self._set(pos, value)
+
+    def undo(self) -> None:
+        """Отменить последний place"""
+        if not self.history:
+            raise ValueError("Nothing to undo")
+        pos, value = self.history.pop()
+        self._set(pos, value)
+
+    def possible_values(self, pos: tp.Tuple[int, int]) -> tp.Set[str]:
+        """То же, что find_possible_values, но по счётчикам: O(size) вместо просмотра строки, столбца и квадрата"""
+        rows, cols, blocks = self.row_counts[pos[0]], self.col_counts[pos[1]], self.block_counts[self._block(pos)]
+        return {SYMBOLS[d] for d in range(self.size) if not rows[d] and not cols[d] and not blocks[d]}
+
+    def conflicts(self, pos: tp.Tuple[int, int]) -> bool:
+        """Повторяется ли цифра клетки pos в её строке, столбце или квадрате"""
+        value = self.cells[pos[0]][pos[1]]
+        if value == ".":
+            return False
+        d = SYMBOLS.index(value)
+        return (
+            self.row_counts[pos[0]][d] > 1
+            or self.col_counts[pos[1]][d] > 1
+            or self.block_counts[self._block(pos)][d] > 1
+        )
+
+    @property
+    def has_conflicts(self) -> bool:
+        return self.duplicates > 0
+
+    def is_solvable(self) -> bool:
+        """Можно ли дорешать текущее поле. Результат кэшируется до следующего изменения"""
+        if self._solvable is None:
+            self._solvable = not self.has_conflicts and count_solutions(self.cells, limit=1) > 0
+        return self._solvable
+
+    @property
+    def grid(self) -> tp.List[tp.List[str]]:
+        return [row[:] for row in self.cells]
+
 
+def _random_solution(rng: random.Random) -> tp.List[str]:
+    """Случайное решённое поле: три диагональных квадрата независимы, остальное достраивается"""
+    cells = ["."] * 81
+    for block in (0, 4, 8):
+        for i, value in zip(_UNITS[18 + block], rng.sample("123456789", 9)):
+            cells[i] = value
+    state = _BitmaskState(cells)
+    state.search()
+    return list(state.to_string())
+
+
+def rate_difficulty(grid: AnyGrid) -> int:
+    """Сложность пазла: сколько раз движку "bitmask" пришлось угадывать (0 - хватает одиночек)
+    >>> rate_difficulty(read_sudoku('puzzle1.txt'))
+    0
+    """
+    state = _BitmaskState(value for row in grid for value in row)
+    state.search()
+    return state.guesses
 
-def generate_sudoku(N: int) -> tp.List[tp.List[str]]:
+
+def _remove_clues(cells: tp.List[str], order: tp.Iterable[int], N: int, filled: int) -> int:
+    # Удалять клетки order по очереди, пока подсказок больше N, оставляя только
+    # удаления, после которых решение единственное. Возвращает число подсказок
+    for i in order:
+        if filled == N:
+            break
+        if cells[i] == ".":
+            continue
+        value, cells[i] = cells[i], "."
+        if _BitmaskState(cells).count(2) != 1:
+            cells[i] = value
+            continue
+        filled -= 1
+    return filled
+
+
+def generate_sudoku(
+    N: int,
+    unique: bool = False,
+    difficulty: tp.Optional[int] = None,
+    rng: tp.Optional[random.Random] = None,
+    attempts: int = 100,
+    swaps: int = 300,
+) -> tp.List[tp.List[str]]:
     """Генерация судоку заполненного на N элементов
+
+    Берётся случайное решённое поле и из него в случайном порядке удаляются
+    клетки. С unique=True клетка удаляется, только если решение остаётся
+    единственным (подсчёт решений останавливается на втором). Такое удаление
+    застревает на минимальном пазле примерно из 22-26 подсказок, поэтому
+    дальше до swaps раз одна-две подсказки возвращаются и удаление
+    повторяется. Так за попытку надёжно получается 21 подсказка, 20 - лишь
+    изредка, 17-19 на практике не получаются. С
+    difficulty принимаются только пазлы, для которых rate_difficulty не
+    меньше difficulty. Если за attempts попыток такой пазл не нашёлся,
+    ValueError.
     >>> grid = generate_sudoku(40)
     >>> sum(1 for row in grid for e in row if e == '.')
     41
@@ -147,16 +856,187 @@ def generate_sudoku(N: int) -> tp.List[tp.List[str]]:
     >>> solution = solve(grid)
     >>> check_solution(solution)
     True
+    >>> grid = generate_sudoku(30, unique=True, rng=random.Random(1))
+    >>> count_solutions(grid, limit=2)
+    1
     """
-    pass
+    rng = rng or random.Random()
+    N = max(0, min(N, 81))
+    for _ in range(attempts):
+        solution = _random_solution(rng)
+        cells = list(solution)
+        if unique:
+            filled = _remove_clues(cells, rng.sample(range(81), 81), N, 81)
+            for _ in range(swaps):
+                if filled == N:
+                    break
+                trial = list(cells)
+                back = rng.sample([i for i in range(81) if trial[i] == "."], rng.randint(1, 2))
+                for i in back:
+                    trial[i] = solution[i]
+                order = (i for i in rng.sample(range(81), 81) if i not in back)
+                count = _remove_clues(trial, order, N, filled + len(back))
+                # Пазлы не хуже текущего тоже принимаются, чтобы не стоять на месте
+                if count <= filled:
+                    cells, filled = trial, count
+        else:
+            for i in rng.sample(range(81), 81 - N):
+                cells[i] = "."
+            filled = N
+        if filled == N and (difficulty is None or rate_difficulty(group(cells, 9)) >= difficulty):
+            return group(cells, 9)
+    raise ValueError(f"Could not generate a puzzle with {N} clues in {attempts} attempts")
 
 
-if __name__ == "__main__":
-    for fname in ["puzzle1.txt", "puzzle2.txt", "puzzle3.txt"]:
-        grid = read_sudoku(fname)
-        display(grid)
-        solution = solve(grid)
-        if not solution:
-            print(f"Puzzle {fname} can't be solved")
+def generate_stream(N: int, rate: tp.Optional[float] = None, **kwargs: tp.Any) -> tp.Iterator[tp.List[tp.List[str]]]:
+    """Бесконечный поток пазлов generate_sudoku(N, **kwargs) не чаще rate пазлов в секунду"""
+    interval = 1 / rate if rate else 0.0
+    deadline = time.perf_counter()
+    while True:
+        yield generate_sudoku(N, **kwargs)
+        deadline += interval
+        delay = deadline - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
         else:
-            display(solution)
\ No newline at end of file
+            deadline = time.perf_counter()
+
+
+class SolveRecord(tp.NamedTuple):
+    """Результат решения одного пазла из пакета"""
+
+    number: int
+    puzzle: str
+    solution: tp.Optional[str]
+    seconds: float
+    # Запись SolveStats, если solve_many вызван со stats
+    stats: tp.Optional[tp.Dict[str, tp.Any]] = None
+
+
+def _solve_chunk(start: int, puzzles: tp.List[str], engine: str, collect_stats: bool) -> tp.List[SolveRecord]:
+    records = []
+    stats = SolveStats() if collect_stats else None
+    for number, puzzle in enumerate(puzzles, start):
+        began = time.perf_counter()
+        solution = solve(Grid.from_string(puzzle), engine=engine, stats=stats)
+        seconds = time.perf_counter() - began
+        record = stats.records[-1] if stats is not None else None
+        records.append(SolveRecord(number, puzzle, str(solution) if solution else None, seconds, record))
+    return records
+
+
+def _solve_records(
+    puzzles: tp.Iterable[str],
+    workers: tp.Optional[int],
+    chunk_size: int,
+    ordered: bool,
+    engine: str,
+    collect_stats: bool,
+) -> tp.Iterator[SolveRecord]:
+    source = iter(puzzles)
+    batches = zip(itertools.count(0, chunk_size), iter(lambda: list(itertools.islice(source, chunk_size)), []))
+    if workers == 1:
+        for start, chunk in batches:
+            yield from _solve_chunk(start, chunk, engine, collect_stats)
+        return
+
+    workers = workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        max_pending = 2 * workers
+        pending: tp.Dict[Future, int] = {}
+        done_chunks: tp.Dict[int, tp.List[SolveRecord]] = {}
+        next_start = 0
+
+        def submit() -> bool:
+            batch = next(batches, None)
+            if batch is None:
+                return False
+            start, chunk = batch
+            pending[pool.submit(_solve_chunk, start, chunk, engine, collect_stats)] = start
+            return True
+
+        # Готовые пачки, ждущие медленную пачку перед ними, тоже занимают место:
+        # иначе за одной долгой пачкой в памяти мог бы оказаться весь вход
+        while len(pending) + len(done_chunks) < max_pending and submit():
+            pass
+        while pending:
+            finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in finished:
+                start = pending.pop(future)
+                if ordered:
+                    done_chunks[start] = future.result()
+                else:
+                    yield from future.result()
+            while ordered and next_start in done_chunks:
+                records = done_chunks.pop(next_start)
+                next_start += len(records)
+                yield from records
+            while len(pending) + len(done_chunks) < max_pending and submit():
+                pass
+
+
+def solve_many(
+    puzzles: tp.Iterable[str],
+    workers: tp.Optional[int] = None,
+    chunk_size: int = 256,
+    ordered: bool = True,
+    engine: str = "bitmask",
+    stats: tp.Optional[SolveStats] = None,
+) -> tp.Iterator[SolveRecord]:
+    """Решить пазлы (строки по 81 символу) в пуле процессов
+
+    Пазлы читаются из puzzles лениво и отправляются пачками по chunk_size,
+    одновременно в работе не больше 2 * workers пачек, поэтому входной поток
+    может быть сколь угодно длинным. Результаты отдаются по мере готовности:
+    в порядке входа (ordered=True) или в порядке завершения. Если передан
+    stats, воркеры собирают счётчики и они добавляются в stats по мере выдачи.
+    >>> [r.solution[:9] for r in solve_many(["4.....8.5.3..........7......2.....6.....8.4......1.......6.3.7.5..2.....1.4......"], workers=1)]
+    ['417369825']
+    """
+    for record in _solve_records(puzzles, workers, chunk_size, ordered, engine, stats is not None):
+        if stats is not None and record.stats is not None:
+            stats.records.append(record.stats)
+        yield record
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Решение Судоку")
+    parser.add_argument("batch", nargs="?", help="файл с пазлами, '-' для stdin")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--chunk-size", type=int, default=256)
+    parser.add_argument("--unordered", action="store_true", help="выводить решения по мере готовности")
+    parser.add_argument("--stats", help="сохранить статистику перебора в .json или .csv")
+    args = parser.parse_args()
+
+    if args.batch is None:
+        for fname in ["puzzle1.txt", "puzzle2.txt", "puzzle3.txt"]:
+            grid = read_sudoku(fname)
+            display(grid)
+            solution = solve(grid)
+            if not solution:
+                print(f"Puzzle {fname} can't be solved")
+            else:
+                display(solution)
+    else:
+        skipped: tp.List[int] = []
+        batch_stats = SolveStats() if args.stats else None
+        total, total_seconds = 0, 0.0
+        for record in solve_many(
+            (str(grid) for grid in read_puzzles(args.batch, skipped)),
+            workers=args.workers,
+            chunk_size=args.chunk_size,
+            ordered=not args.unordered,
+            stats=batch_stats,
+        ):
+            total += 1
+            total_seconds += record.seconds
+            print(record.solution or f"# puzzle {record.number} can't be solved")
+        for lineno in skipped:
+            print(f"{args.batch}:{lineno}: malformed puzzle skipped", file=sys.stderr)
+        print(f"solved {total} puzzles, {total_seconds:.2f}s of solver time", file=sys.stderr)
+        if batch_stats is not None:
+            with open(args.stats, "w", newline="") as out:
+                if args.stats.endswith(".csv"):
+                    batch_stats.to_csv(out)
+                else:
+                    batch_stats.to_json(out)
@@ -0,0 +1,226 @@
+import collections
+import itertools
+import pathlib
+import shelve
+import sys
+import typing as tp
+
+import sudoku
+
+
+class Transform(tp.NamedTuple):
+    """
+    Преобразование пазла в каноническую форму: транспонирование, затем
+    строка i канонической формы берётся из строки rows[i], столбец j - из
+    столбца cols[j], и цифры переименовываются по словарю labels.
+    """
+
+    transpose: bool
+    rows: tp.Tuple[int, ...]
+    cols: tp.Tuple[int, ...]
+    labels: tp.Dict[str, str]
+
+    def apply(self, cells: str) -> str:
+        cells = _transposed(cells) if self.transpose else cells
+        return "".join(self.labels.get(cells[9 * r + c], ".") for r in self.rows for c in self.cols)
+
+    def invert(self, cells: str) -> str:
+        """Перевести поле из канонической формы обратно в исходную"""
+        inverse = {v: k for k, v in self.labels.items()}
+        free = iter(sorted(set("123456789") - set(self.labels)))
+        for label in "123456789":
+            if label not in inverse:
+                inverse[label] = next(free)
+        out = ["."] * 81
+        for i, r in enumerate(self.rows):
+            for j, c in enumerate(self.cols):
+                value = cells[9 * i + j]
+                out[9 * r + c] = inverse.get(value, ".")
+        result = "".join(out)
+        return _transposed(result) if self.transpose else result
+
+
+def _transposed(cells: str) -> str:
+    return "".join(cells[9 * c + r] for r in range(9) for c in range(9))
+
+
+def _orders(signatures: tp.List[tp.Any]) -> tp.List[tp.List[tp.Tuple[int, ...]]]:
+    """Для трёх элементов с инвариантами signatures - все порядки, сортирующие их по инварианту"""
+    groups = [
+        list(g) for _, g in itertools.groupby(sorted(range(3), key=lambda i: signatures[i]), signatures.__getitem__)
+    ]
+    return [list(itertools.permutations(g)) for g in groups]
+
+
+def _line_orders(cells: str) -> tp.Iterator[tp.Tuple[int, ...]]:
+    """
+    Порядки строк, согласованные с инвариантами: полосы и строки внутри полос
+    сортируются по числу подсказок в строке, отсортированным числам подсказок
+    в каждом из трёх квадратов строки и по тому, сколько раз во всём пазле
+    встречаются цифры строки. Эти инварианты не меняются при перестановках
+    столбцов и переименовании цифр, поэтому одинаковые с точностью до
+    симметрий пазлы получают одинаковые наборы кандидатов.
+    """
+    counts = collections.Counter(value for value in cells if value != ".")
+    row_sig = []
+    for r in range(9):
+        stacks = tuple(sorted(sum(cells[9 * r + c] != "." for c in range(3 * s, 3 * s + 3)) for s in range(3)))
+        digits = tuple(sorted(counts[value] for value in cells[9 * r : 9 * r + 9] if value != "."))
+        row_sig.append((sum(stacks), stacks, digits))
+    band_sig = [tuple(sorted(row_sig[3 * b : 3 * b + 3])) for b in range(3)]
+    for band_parts in itertools.product(*_orders(band_sig)):
+        bands = [b for part in band_parts for b in part]
+        row_parts = []
+        for b in bands:
+            for parts in _orders(row_sig[3 * b : 3 * b + 3]):
+                row_parts.append([tuple(3 * b + r for r in perm) for perm in parts])
+        for rows in itertools.product(*row_parts):
+            yield tuple(r for part in rows for r in part)
+
+
+def _prefixes(orders: tp.Iterable[tp.Tuple[int, ...]]) -> tp.Dict[tp.Tuple[int, ...], tp.List[int]]:
+    """Для каждого начала порядка - строки, которыми его можно продолжить"""
+    following: tp.Dict[tp.Tuple[int, ...], tp.List[int]] = {}
+    for order in orders:
+        for k in range(9):
+            rows = following.setdefault(order[:k], [])
+            if order[k] not in rows:
+                rows.append(order[k])
+    return following
+
+
+def _relabel_row(
+    cells: str, row: int, cols: tp.Tuple[int, ...], labels: tp.Dict[str, str]
+) -> tp.Tuple[str, tp.Dict[str, str]]:
+    # Строка row в порядке cols с цифрами, переименованными в порядке первого появления
+    out = []
+    for c in cols:
+        value = cells[9 * row + c]
+        if value == ".":
+            out.append(value)
+            continue
+        label = labels.get(value)
+        if label is None:
+            labels = dict(labels)
+            label = labels[value] = str(len(labels) + 1)
+        out.append(label)
+    return "".join(out), labels
+
+
+def canonical_form(grid: sudoku.AnyGrid) -> tp.Tuple[str, Transform]:
+    """
+    Каноническая форма пазла с точностью до транспонирования, перестановок
+    полос, стеков, строк и столбцов внутри них и переименования цифр:
+    лексикографически наименьшая строка, где цифры переименованы в порядке
+    первого появления, среди порядков, согласованных с инвариантами.
+
+    Форма строится по строке за раз. На каждом шаге остаются все частичные
+    преобразования (начало порядка строк, порядок столбцов, переименование),
+    дающие наименьшее начало строки, так что перебор точный, но не тратит
+    время на заведомо большие ветви даже у симметричных пазлов, где
+    инварианты ничего не отсекают.
+    >>> key, transform = canonical_form(sudoku.read_sudoku("puzzle1.txt"))
+    >>> transform.apply(str(sudoku.Grid.from_lists(sudoku.read_sudoku("puzzle1.txt")))) == key
+    True
+    """
+    source = "".join(value for row in grid for value in row)
+    # (поле, транспонировано ли, начало порядка строк, порядок столбцов, переименование, продолжения)
+    states: tp.List[tp.Any] = []
+    for transpose in (False, True):
+        cells = _transposed(source) if transpose else source
+        following = _prefixes(_line_orders(cells))
+        for cols in _line_orders(_transposed(cells)):
+            states.append((cells, transpose, (), cols, {}, following))
+    form = []
+    for _ in range(9):
+        best: tp.Optional[str] = None
+        survivors: tp.Dict[tp.Any, tp.Any] = {}
+        for cells, transpose, rows, cols, labels, following in states:
+            for r in following[rows]:
+                line, new_labels = _relabel_row(cells, r, cols, labels)
+                if best is None or line < best:
+                    best, survivors = line, {}
+                if line == best:
+                    # Продолжения зависят только от набора уже взятых строк, а не от их порядка
+                    key = (transpose, frozenset(rows + (r,)), cols, frozenset(new_labels.items()))
+                    survivors.setdefault(key, (cells, transpose, rows + (r,), cols, new_labels, following))
+        assert best is not None
+        form.append(best)
+        states = list(survivors.values())
+    _, transpose, rows, cols, labels, _ = states[0]
+    return "".join(form), Transform(transpose, rows, cols, labels)
+
+
+class SolutionCache:
+    """
+    Кэш решений, ключ - каноническая форма пазла. В памяти хранится не
+    больше maxsize решений с вытеснением давно не использованных, с path
+    решения также пишутся в файл shelve и переживают перезапуск.
+    """
+
+    def __init__(self, maxsize: int = 10000, path: tp.Optional[tp.Union[str, pathlib.Path]] = None) -> None:
+        self.maxsize = maxsize
+        self.entries: "collections.OrderedDict[str, str]" = collections.OrderedDict()
+        self.disk = shelve.open(str(path)) if path is not None else None
+        self.hits = 0
+        self.misses = 0
+
+    def close(self) -> None:
+        if self.disk is not None:
+            self.disk.close()
+            self.disk = None
+
+    def __enter__(self) -> "SolutionCache":
+        return self
+
+    def __exit__(self, *args: tp.Any) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    @property
+    def hit_ratio(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    @property
+    def memory_bytes(self) -> int:
+        """Приблизительный объём памяти, занятый кэшем в памяти"""
+        return sys.getsizeof(self.entries) + sum(sys.getsizeof(k) + sys.getsizeof(v) for k, v in self.entries.items())
+
+    def _lookup(self, key: str) -> tp.Optional[str]:
+        if key in self.entries:
+            self.entries.move_to_end(key)
+            return self.entries[key]
+        if self.disk is not None and key in self.disk:
+            solution: str = self.disk[key]
+            self._remember(key, solution)
+            return solution
+        return None
+
+    def _remember(self, key: str, solution: str) -> None:
+        self.entries[key] = solution
+        self.entries.move_to_end(key)
+        if len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+
+    def solve(self, grid: sudoku.GridT, engine: tp.Optional[str] = None) -> tp.Optional[sudoku.GridT]:
+        """Решить пазл как sudoku.solve, но взять решение из кэша, если там есть эквивалентный пазл"""
+        key, transform = canonical_form(grid)
+        cached = self._lookup(key)
+        if cached is not None:
+            self.hits += 1
+            solution = transform.invert(cached)
+        else:
+            self.misses += 1
+            solved = sudoku.solve(sudoku.Grid.from_string(key), engine=engine)
+            if solved is None:
+                return None
+            self._remember(key, str(solved))
+            if self.disk is not None:
+                self.disk[key] = str(solved)
+            solution = transform.invert(str(solved))
+        if isinstance(grid, sudoku.Grid):
+            return sudoku.Grid.from_string(solution)
+        return sudoku.create_grid(solution)
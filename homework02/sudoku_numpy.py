@@ -0,0 +1,53 @@
+import typing as tp
+
+import numpy as np
+import sudoku
+
+# Все цифры 1-9 в блоке дают биты 1..9
+_FULL_UNIT = 0b1111111110
+
+
+def _cells(grid: tp.Union[sudoku.AnyGrid, str]) -> bytes:
+    if isinstance(grid, str):
+        grid = sudoku.Grid.from_string(grid)
+    elif not isinstance(grid, sudoku.Grid):
+        grid = sudoku.Grid.from_lists(grid)
+    return bytes(grid.cells)
+
+
+def to_array(grids: tp.Iterable[tp.Union[sudoku.AnyGrid, str]]) -> np.ndarray:
+    """Собрать пазлы в массив (N, 9, 9) из uint8, пустые клетки - нули"""
+    cells = np.frombuffer(b"".join(_cells(grid) for grid in grids), dtype=np.uint8)
+    cells = np.where(cells == ord("."), 0, cells - ord("0")).astype(np.uint8)
+    return cells.reshape(-1, 9, 9)
+
+
+def check_solutions(grids: np.ndarray) -> tp.Tuple[np.ndarray, np.ndarray]:
+    """
+    Проверить сразу N решений, заданных массивом (N, 9, 9) с цифрами 1-9.
+
+    Возвращает маску верных решений и для каждого решения номер первого
+    нарушенного блока в порядке строки 0-8, столбцы 9-17, квадраты 18-26
+    (-1, если решение верно).
+    >>> grids = to_array([sudoku.solve(sudoku.read_sudoku("puzzle1.txt")), "1" * 81])
+    >>> ok, first = check_solutions(grids)
+    >>> ok.tolist(), first.tolist()
+    ([True, False], [-1, 0])
+    """
+    grids = np.asarray(grids)
+    n = grids.shape[0]
+    values = np.where((grids >= 1) & (grids <= 9), grids, 0).astype(np.uint16)
+    bits = np.left_shift(np.uint16(1), values)
+    blocks = bits.reshape(n, 3, 3, 3, 3).transpose(0, 1, 3, 2, 4).reshape(n, 9, 9)
+    units = np.concatenate(
+        [
+            np.bitwise_or.reduce(bits, axis=2),
+            np.bitwise_or.reduce(bits, axis=1),
+            np.bitwise_or.reduce(blocks, axis=2),
+        ],
+        axis=1,
+    )
+    units_ok = units == _FULL_UNIT
+    valid = units_ok.all(axis=1)
+    first = np.where(valid, -1, np.argmin(units_ok, axis=1))
+    return valid, first
@@ -1,8 +1,23 @@
+import io
+import os
+import time
 import unittest
+from unittest import mock
 
 import sudoku
 
 
+def _path(name):
+    # Файлы с пазлами лежат рядом с тестами, а тесты запускаются из любого каталога
+    return os.path.join(os.path.dirname(__file__), name)
+
+
+def _slow_first_chunk(start, puzzles, engine, collect_stats, solve_chunk=sudoku._solve_chunk):
+    if start == 0:
+        time.sleep(1)
+    return solve_chunk(start, puzzles, engine, collect_stats)
+
+
 class SudokuTestCase(unittest.TestCase):
     def test_group(self):
         values = [1, 2, 3, 4]
@@ -239,4 +254,175 @@ class SudokuTestCase(unittest.TestCase):
         self.assertEqual(expected_unknown, actual_unknown)
         solution = sudoku.solve(grid)
         solved = sudoku.check_solution(solution)
-        self.assertTrue(solved)
\ No newline at end of file
+        self.assertTrue(solved)
+
+    def test_solve_many(self):
+        with open(_path("hard_puzzles.txt")) as f:
+            puzzles = [line.strip() for line in f][:12]
+        records = list(sudoku.solve_many(puzzles, workers=2, chunk_size=5))
+        self.assertEqual(list(range(12)), [record.number for record in records])
+        for record in records:
+            self.assertEqual(puzzles[record.number], record.puzzle)
+            self.assertTrue(sudoku.check_solution(sudoku.create_grid(record.solution)))
+
+        records = list(sudoku.solve_many(puzzles, workers=2, chunk_size=5, ordered=False))
+        self.assertEqual(list(range(12)), sorted(record.number for record in records))
+
+    def test_solve_many_slow_first_chunk(self):
+        with open(_path("hard_puzzles.txt")) as f:
+            puzzle = f.readline().strip()
+        taken = []
+
+        def puzzles():
+            for number in range(40):
+                taken.append(number)
+                yield puzzle
+
+        with mock.patch.object(sudoku, "_solve_chunk", _slow_first_chunk):
+            records = sudoku.solve_many(puzzles(), workers=2, chunk_size=1)
+            self.assertEqual(0, next(records).number)
+            # Пока первая пачка считается, остальные не копятся: в работе
+            # и в ожидании вместе не больше 2 * workers пачек
+            self.assertLessEqual(len(taken), 4)
+            self.assertEqual(list(range(1, 40)), [record.number for record in records])
+
+    def test_grid(self):
+        puzzle = "53..7....6..195....98....6.8...6...34..8.3..17...2...6.6....28....419..5....8..79"
+        lists = sudoku.create_grid(puzzle)
+        grid = sudoku.Grid.from_string(puzzle)
+        self.assertEqual(puzzle, str(grid))
+        self.assertEqual(lists, grid.to_lists())
+        self.assertEqual(grid, sudoku.Grid.from_lists(lists))
+        self.assertEqual(lists, sudoku.create_grid(grid))
+        for pos in [(0, 0), (4, 7), (8, 8)]:
+            self.assertEqual(sudoku.get_row(lists, pos), sudoku.get_row(grid, pos))
+            self.assertEqual(sudoku.get_col(lists, pos), sudoku.get_col(grid, pos))
+            self.assertEqual(sudoku.get_block(lists, pos), sudoku.get_block(grid, pos))
+            self.assertEqual(sudoku.find_possible_values(lists, pos), sudoku.find_possible_values(grid, pos))
+        self.assertEqual((0, 2), sudoku.find_empty_positions(grid))
+
+        solution = sudoku.solve(grid)
+        self.assertIsInstance(solution, sudoku.Grid)
+        self.assertTrue(sudoku.check_solution(solution))
+        self.assertEqual(solution, sudoku.solve(grid, engine="backtracking"))
+
+    def test_solve_other_sizes(self):
+        grid = [
+            ["1", ".", ".", "."],
+            [".", ".", "3", "."],
+            [".", "4", ".", "."],
+            [".", ".", ".", "2"],
+        ]
+        solution = sudoku.solve(grid)
+        self.assertEqual("1", solution[0][0])
+        self.assertTrue(sudoku.check_solution(solution))
+
+        puzzle = (
+            "1.3.5.7.9.BCD.FG" "5.7.9.B.D.F.1.3." "9.B.D.F.1.3.5.7." "D.F.1.3.5.7.9.B."
+            "2.4.6.8.A.C.E.G." "6.8.A.C.E.G.2.4." "A.C.E.G.2.4.6.8." "E.G.2.4.6.8.A.C."
+            "3.5.7.9.B.D.F.1." "7.9.B.D.F.1.3.5." "B.D.F.1.3.5.7.9." "F.1.3.5.7.9.B.D."
+            "4.6.8.A.C.E.G.2." "8.A.C.E.G.2.4.6." "C.E.G.2.4.6.8.A." "G.2.4.6.8.A.C.E."
+        )
+        grid = sudoku.create_grid(puzzle)
+        self.assertEqual(16, len(grid))
+        solution = sudoku.solve(grid)
+        self.assertTrue(sudoku.check_solution(solution))
+        self.assertEqual(list("123456789ABCDEFG"), solution[0])
+
+    def test_count_solutions(self):
+        self.assertEqual(288, sudoku.count_solutions(sudoku.create_grid("." * 16)))
+        self.assertEqual(2, sudoku.count_solutions(sudoku.create_grid("." * 81), limit=2))
+        grid = sudoku.read_sudoku(_path("puzzle1.txt"))
+        self.assertEqual(1, sudoku.count_solutions(grid))
+        grid[0][0] = grid[0][1]
+        self.assertEqual(0, sudoku.count_solutions(grid))
+
+    def test_generate_unique_sudoku(self):
+        grid = sudoku.generate_sudoku(30, unique=True)
+        self.assertEqual(51, sum(1 for row in grid for e in row if e == "."))
+        self.assertEqual(1, sudoku.count_solutions(grid, limit=2))
+
+        grid = sudoku.generate_sudoku(30, unique=True, difficulty=2)
+        self.assertGreaterEqual(sudoku.rate_difficulty(grid), 2)
+
+        self.assertRaises(ValueError, sudoku.generate_sudoku, 10, unique=True, attempts=1, swaps=20)
+
+    def test_read_puzzles(self):
+        grids = list(sudoku.read_puzzles(_path("hard_puzzles.txt")))
+        self.assertEqual(95, len(grids))
+        with open(_path("hard_puzzles.txt")) as f:
+            self.assertEqual(f.readline().strip(), str(grids[0]))
+
+        grid = next(sudoku.read_puzzles(_path("puzzle1.txt")))
+        self.assertEqual(sudoku.read_sudoku(_path("puzzle1.txt")), grid.to_lists())
+
+        stream = io.BytesIO(
+            b"53..7....\n6..195...\n.98....6.\n8...6...3\n4..8.3..1\n7...2...6\n.6....28.\n...419..5\n....8..79\n"
+            b"\n"
+            b"123\n"
+            + b"0" * 81 + b"\n"
+            + b"12345678x" * 9 + b"\n"
+        )
+        skipped = []
+        grids = list(sudoku.read_puzzles(stream, skipped))
+        self.assertEqual([grid, sudoku.Grid(b"." * 81)], grids)
+        self.assertEqual([11, 13], skipped)
+
+        text = io.StringIO(str(grid).replace(".", "0") + "\n" + "." * 81 + "\n")
+        self.assertEqual([grid, sudoku.Grid(b"." * 81)], list(sudoku.read_puzzles(text)))
+
+    def test_solve_stats(self):
+        stats = sudoku.SolveStats()
+        with open(_path("hard_puzzles.txt")) as f:
+            puzzles = [line.strip() for line in f][:6]
+        for puzzle in puzzles[:3]:
+            sudoku.solve(sudoku.create_grid(puzzle), stats=stats)
+        for puzzle in puzzles[3:]:
+            sudoku.solve(sudoku.create_grid(puzzle), engine="dlx", stats=stats)
+        self.assertEqual(6, len(stats))
+        for record in stats.records:
+            self.assertTrue(record["solved"])
+            self.assertGreater(record["nodes"], 0)
+            self.assertGreaterEqual(record["nodes"], record["max_depth"])
+            self.assertGreater(record["seconds"], 0)
+        self.assertEqual(["bitmask"] * 3 + ["dlx"] * 3, [record["engine"] for record in stats.records])
+        self.assertEqual(6, sum(count for _, _, count in stats.histogram("nodes", bins=4)))
+
+        out = io.StringIO()
+        stats.to_csv(out)
+        self.assertEqual(7, len(out.getvalue().splitlines()))
+        out = io.StringIO()
+        stats.to_json(out)
+        self.assertIn('"summary"', out.getvalue())
+
+        stats = sudoku.SolveStats()
+        records = list(sudoku.solve_many(puzzles, workers=2, chunk_size=2, stats=stats))
+        self.assertEqual([record.stats for record in records], stats.records)
+
+    def test_sudoku_board(self):
+        grid = sudoku.read_sudoku(_path("puzzle1.txt"))
+        board = sudoku.SudokuBoard(grid)
+        for pos in [(0, 2), (4, 7), (8, 0)]:
+            self.assertEqual(sudoku.find_possible_values(grid, pos), board.possible_values(pos))
+        self.assertFalse(board.has_conflicts)
+        self.assertTrue(board.is_solvable())
+        self.assertRaises(ValueError, board.place, (0, 0), "1")
+
+        board.place((0, 2), "4")
+        self.assertNotIn("4", board.possible_values((0, 3)))
+        self.assertTrue(board.is_solvable())
+        board.place((0, 3), "4")
+        self.assertTrue(board.conflicts((0, 3)))
+        self.assertTrue(board.conflicts((0, 2)))
+        self.assertFalse(board.conflicts((0, 0)))
+        self.assertFalse(board.is_solvable())
+        board.undo()
+        self.assertFalse(board.has_conflicts)
+        board.place((0, 2), "1")
+        self.assertFalse(board.has_conflicts)
+        self.assertFalse(board.is_solvable())
+        board.undo()
+        board.undo()
+        self.assertEqual(grid, board.grid)
+        self.assertTrue(board.is_solvable())
+        self.assertRaises(ValueError, board.undo)
@@ -0,0 +1,73 @@
+import itertools
+import os
+import random
+import tempfile
+import unittest
+
+import sudoku
+import sudoku_cache
+
+
+def relabel_and_permute(puzzle):
+    rows = [3, 5, 4, 0, 2, 1, 8, 6, 7]
+    cols = [6, 7, 8, 2, 1, 0, 4, 3, 5]
+    labels = dict(zip("123456789.", "918273645."))
+    transposed = [puzzle[9 * c + r] for r in range(9) for c in range(9)]
+    return "".join(labels[transposed[9 * r + c]] for r in rows for c in cols)
+
+
+class SolutionCacheTestCase(unittest.TestCase):
+    def setUp(self):
+        with open(os.path.join(os.path.dirname(__file__), "hard_puzzles.txt")) as f:
+            self.puzzles = [line.strip() for line in f][:5]
+
+    def test_canonical_form(self):
+        for puzzle in self.puzzles:
+            key, transform = sudoku_cache.canonical_form(sudoku.create_grid(puzzle))
+            self.assertEqual(key, transform.apply(puzzle))
+            self.assertEqual(puzzle, transform.invert(key))
+            other_key, _ = sudoku_cache.canonical_form(sudoku.create_grid(relabel_and_permute(puzzle)))
+            self.assertEqual(key, other_key)
+
+    def test_canonical_form_symmetric(self):
+        solved = str(sudoku.solve(sudoku.Grid.from_string(self.puzzles[0])))
+        # 27 подсказок, по одной в каждой строке каждого квадрата: инварианты по числу
+        # подсказок у всех строк и столбцов совпадают и ничего не отсекают
+        uniform = "".join(v if r % 3 == c % 3 else "." for (r, c), v in zip(itertools.product(range(9), repeat=2), solved))
+        for puzzle in [solved, uniform]:
+            key, transform = sudoku_cache.canonical_form(sudoku.create_grid(puzzle))
+            self.assertEqual(puzzle, transform.invert(key))
+            rng = random.Random(puzzle)
+            for _ in range(5):
+                bands, stacks = rng.sample(range(3), 3), rng.sample(range(3), 3)
+                rows = [3 * b + r for b in bands for r in rng.sample(range(3), 3)]
+                cols = [3 * s + c for s in stacks for c in rng.sample(range(3), 3)]
+                labels = dict(zip("123456789.", "".join(rng.sample("123456789", 9)) + "."))
+                other = "".join(labels[puzzle[9 * r + c]] for r in rows for c in cols)
+                self.assertEqual(key, sudoku_cache.canonical_form(sudoku.create_grid(other))[0])
+                self.assertEqual(key, sudoku_cache.canonical_form(sudoku.create_grid(relabel_and_permute(other)))[0])
+
+    def test_solve(self):
+        cache = sudoku_cache.SolutionCache(maxsize=3)
+        for puzzle in self.puzzles:
+            self.assertEqual(sudoku.solve(sudoku.create_grid(puzzle)), cache.solve(sudoku.create_grid(puzzle)))
+        self.assertEqual(0.0, cache.hit_ratio)
+        self.assertEqual(3, len(cache))
+
+        for puzzle in self.puzzles[2:]:
+            other = relabel_and_permute(puzzle)
+            solution = cache.solve(sudoku.Grid.from_string(other))
+            self.assertEqual(sudoku.solve(sudoku.Grid.from_string(other)), solution)
+        self.assertEqual(3 / 8, cache.hit_ratio)
+        self.assertGreater(cache.memory_bytes, 0)
+
+    def test_disk_cache(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "solutions")
+            with sudoku_cache.SolutionCache(maxsize=1, path=path) as cache:
+                for puzzle in self.puzzles:
+                    cache.solve(sudoku.create_grid(puzzle))
+            with sudoku_cache.SolutionCache(maxsize=1, path=path) as cache:
+                for puzzle in self.puzzles:
+                    cache.solve(sudoku.create_grid(relabel_and_permute(puzzle)))
+                self.assertEqual(1.0, cache.hit_ratio)
@@ -0,0 +1,35 @@
+import os
+import unittest
+
+import numpy as np
+import sudoku
+import sudoku_numpy
+
+PUZZLE_PATH = os.path.join(os.path.dirname(__file__), "puzzle1.txt")
+
+
+class CheckSolutionsTestCase(unittest.TestCase):
+    def test_to_array(self):
+        grid = sudoku.read_sudoku(PUZZLE_PATH)
+        array = sudoku_numpy.to_array([grid, sudoku.Grid.from_lists(grid), str(sudoku.Grid.from_lists(grid))])
+        self.assertEqual((3, 9, 9), array.shape)
+        self.assertEqual(np.uint8, array.dtype)
+        self.assertEqual([5, 3, 0, 0, 7, 0, 0, 0, 0], array[0, 0].tolist())
+        self.assertTrue((array[0] == array[2]).all())
+
+    def test_check_solutions(self):
+        good = sudoku.solve(sudoku.read_sudoku(PUZZLE_PATH))
+        not_solved = [row[:] for row in good]
+        not_solved[8][8] = "."
+        bad_col = [row[:] for row in good]
+        bad_col[1] = bad_col[0][:]
+        bad_block = [row[1:] + row[:1] for row in good]
+        grids = [good, not_solved, bad_col, bad_block]
+
+        ok, first = sudoku_numpy.check_solutions(sudoku_numpy.to_array(grids))
+        self.assertEqual([sudoku.check_solution(grid) for grid in grids], ok.tolist())
+        self.assertEqual([-1, 8, 9, 18], first.tolist())
+
+        ok, first = sudoku_numpy.check_solutions(sudoku_numpy.to_array([bad_block[:3] * 3]))
+        self.assertEqual([False], ok.tolist())
+        self.assertEqual([9], first.tolist())
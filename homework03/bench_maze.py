@@ -0,0 +1,136 @@
+import os
+import sys
+import time
+from random import choice, sample, seed
+from typing import List, Tuple
+
+import maze
+import maze_numpy
+import numpy as np
+
+# Волновой алгоритм на больших сетках работает минутами, поэтому для него размеры меньше
+SIZES = {
+    "wave": [11, 51, 101, 201],
+    "bfs": [11, 51, 101, 201, 501, 1001, 2001],
+}
+
+
+def grid_memory(size: int) -> Tuple[int, int]:
+    """Байты, занятые лабиринтом size x size в виде списков и в виде MazeGrid"""
+    seed(0)
+    grid = maze.bin_tree_maze(size, size, random_exit=False)
+    lists = sys.getsizeof(grid) + sum(sys.getsizeof(row) for row in grid)
+    return lists, sys.getsizeof(maze.MazeGrid.from_lists(grid).cells)
+
+
+def bench_generate(size: int, vectorized: bool) -> float:
+    """Секунды на генерацию лабиринта size x size циклом maze.bin_tree_maze или maze_numpy"""
+    start = time.perf_counter()
+    if vectorized:
+        maze_numpy.bin_tree_maze(size, size, rng=np.random.default_rng(0))
+    else:
+        seed(0)
+        maze.bin_tree_maze(size, size)
+    return time.perf_counter() - start
+
+
+def bench_generator(algorithm: str, size: int) -> float:
+    """Секунды на генерацию лабиринта size x size алгоритмом из maze.GENERATORS"""
+    seed(0)
+    start = time.perf_counter()
+    maze.generate_maze(size, size, algorithm=algorithm)
+    return time.perf_counter() - start
+
+
+def bench_solve(algorithm: str, size: int, repeats: int = 3, generator: str = "bin_tree") -> Tuple[float, int, int]:
+    """
+    Среднее время решения лабиринта size x size, длина найденного пути и
+    среднее число раскрытых клеток. Лабиринт "bin_tree" строится
+    maze.bin_tree_maze, остальные - maze.generate_maze.
+    """
+    total = 0.0
+    length = 0
+    counters = {"expanded": 0}
+    for i in range(repeats):
+        seed(i)
+        if generator == "bin_tree":
+            grid: maze.Maze = maze.bin_tree_maze(size, size, random_exit=False)
+        else:
+            grid = maze.generate_maze(size, size, algorithm=generator, random_exit=False)
+        start = time.perf_counter()
+        _, path = maze.solve_maze(grid, algorithm=algorithm, counters=counters)
+        total += time.perf_counter() - start
+        length = len(path) if path else 0
+    return total / repeats, length, counters["expanded"] // repeats
+
+
+def bench_batch(count: int, size: int, workers: int) -> float:
+    """Секунды на решение count лабиринтов size x size через maze.solve_mazes"""
+    seed(0)
+    grids = [maze.generate_maze(size, size, algorithm="kruskal") for _ in range(count)]
+    start = time.perf_counter()
+    for _ in maze.solve_mazes(grids, workers=workers):
+        pass
+    return time.perf_counter() - start
+
+
+def bench_index(size: int, generator: str, queries: int = 20, loops: int = 0) -> Tuple[float, float, float]:
+    """
+    Секунды на построение maze.MazeIndex по лабиринту size x size и среднее
+    время запроса между случайными клетками: через индекс (каждый раз из
+    новой клетки) и через BFS. loops стен сносится, чтобы появились петли.
+    """
+    seed(0)
+    grid = maze.generate_maze(size, size, algorithm=generator)
+    walls = [(x, y) for x in range(1, size - 1) for y in range(1, size - 1) if not grid.cells[x * size + y]]
+    for x, y in sample(walls, loops):
+        grid[x, y] = " "
+    start = time.perf_counter()
+    index = maze.MazeIndex(grid)
+    build = time.perf_counter() - start
+    free = [divmod(i, size) for i, cell in enumerate(grid.cells) if cell]
+    pairs = [(choice(free), choice(free)) for _ in range(queries)]
+    start = time.perf_counter()
+    for a, b in pairs:
+        index.path(a, b)
+    indexed = (time.perf_counter() - start) / queries
+    start = time.perf_counter()
+    for a, b in pairs:
+        list(maze.ALGORITHMS["bfs"](grid, a, b) or [])
+    flood = (time.perf_counter() - start) / queries
+    return build, indexed, flood
+
+
+if __name__ == "__main__":
+    ALGORITHMS: List[str] = sys.argv[1:] or list(maze.ALGORITHMS)
+    LISTS_BYTES, GRID_BYTES = grid_memory(1001)
+    print(f"1001x1001 memory: lists {LISTS_BYTES / 2**20:.1f} MB, MazeGrid {GRID_BYTES / 2**20:.1f} MB")
+    for SIZE in (1001, 2001, 10001):
+        for VECTORIZED in (False, True) if SIZE <= 2001 else (True,):
+            SECONDS = bench_generate(SIZE, VECTORIZED)
+            NAME = "numpy" if VECTORIZED else "python"
+            print(f"generate {NAME:>6} {SIZE:>5}x{SIZE:<5}: {SECONDS:.4f}s, {SIZE * SIZE / SECONDS:.0f} cells/s")
+    for GENERATOR in maze.GENERATORS:
+        for SIZE in (201, 501, 1001):
+            SECONDS = bench_generator(GENERATOR, SIZE)
+            print(f"generate {GENERATOR:>8} {SIZE:>5}x{SIZE:<5}: {SECONDS:.4f}s, {SIZE * SIZE / SECONDS:.0f} cells/s")
+    for COUNT, SIZE in ((2000, 51), (8, 1001)):
+        for WORKERS in sorted({1, 2, 4, os.cpu_count() or 1}):
+            SECONDS = bench_batch(COUNT, SIZE, WORKERS)
+            print(
+                f"batch {COUNT:>5} x {SIZE:>5}x{SIZE:<5} workers {WORKERS:>2}: {SECONDS:.2f}s, {COUNT / SECONDS:.1f} mazes/s"
+            )
+    for GENERATOR, SIZE, LOOPS in (("kruskal", 1001, 0), ("dfs", 2001, 0), ("kruskal", 1001, 1000)):
+        BUILD, INDEXED, FLOOD = bench_index(SIZE, GENERATOR, loops=LOOPS)
+        print(
+            f"index {GENERATOR:>8} {SIZE:>5}x{SIZE:<5} loops {LOOPS:>5}: build {BUILD:.2f}s, "
+            f"query {INDEXED * 1000:.1f} ms, bfs {FLOOD * 1000:.1f} ms"
+        )
+    for GENERATOR in ("bin_tree", "dfs", "kruskal"):
+        for ALGORITHM in ALGORITHMS:
+            for SIZE in SIZES.get(ALGORITHM, SIZES["bfs"]):
+                SECONDS, LENGTH, EXPANDED = bench_solve(ALGORITHM, SIZE, generator=GENERATOR)
+                print(
+                    f"{GENERATOR:>8} {ALGORITHM:>13} {SIZE:>5}x{SIZE:<5} path {LENGTH:>7}, expanded {EXPANDED:>8}: "
+                    f"{SECONDS:.4f}s, {SIZE * SIZE / SECONDS:.0f} cells/s"
+                )
@@ -1,9 +1,243 @@
 
-from random import choice, randint
-from typing import List, Optional, Tuple, Union
+import mmap
+import os
+import struct
+import sys
+import time
+from array import array
+from collections import OrderedDict, deque
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from copy import deepcopy
+from heapq import heapify, heappop, heappush
+from itertools import chain
+from multiprocessing import shared_memory
+from random import choice, randint, random, randrange, shuffle
+from typing import (
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Literal,
+    NamedTuple,
+    Optional,
+    Tuple,
+    Union,
+    overload,
+)
 
 import pandas as pd
 
+# Коды клеток в MazeGrid
+WALL, EMPTY, EXIT = 0, 1, 2
+_SYMBOLS = "■ X"
+_CODES = {symbol: code for code, symbol in enumerate(_SYMBOLS)}
+
+
+class _RowView:
+    # Строка MazeGrid без копирования: grid[x][y] читает и пишет прямо в буфер
+    __slots__ = ("grid", "x")
+
+    def __init__(self, grid: "MazeGrid", x: int) -> None:
+        self.grid = grid
+        self.x = x
+
+    def __len__(self) -> int:
+        return self.grid.cols
+
+    def __getitem__(self, y: int) -> str:
+        return self.grid[self.x, y]
+
+    def __setitem__(self, y: int, value: str) -> None:
+        self.grid[self.x, y] = value
+
+    def __iter__(self) -> Iterator[str]:
+        return (_SYMBOLS[code] for code in self.grid.row_view(self.x))
+
+
+class MazeGrid:
+    """
+    Лабиринт в одном bytearray по строкам, байт на клетку (WALL, EMPTY, EXIT).
+    grid[x][y] и grid[x, y] работают как у списка списков, copy() не копирует
+    буфер, пока одна из копий не изменится. version растёт при каждой записи
+    через grid[x, y] = ..., по нему MazeIndex замечает изменения.
+    """
+
+    __slots__ = ("rows", "cols", "cells", "version", "_shared")
+
+    def __init__(self, rows: int, cols: int, cells: Optional[bytearray] = None) -> None:
+        self.rows = rows
+        self.cols = cols
+        self.cells = cells if cells is not None else bytearray(rows * cols)
+        self.version = 0
+        self._shared = False
+
+    @classmethod
+    def from_lists(cls, grid: List[List[Union[str, int]]]) -> "MazeGrid":
+        cells = bytearray(_CODES[cell] for row in grid for cell in row)  # type: ignore[index]
+        return cls(len(grid), len(grid[0]) if grid else 0, cells)
+
+    def to_lists(self) -> List[List[Union[str, int]]]:
+        return [list(self[x]) for x in range(self.rows)]
+
+    def __len__(self) -> int:
+        return self.rows
+
+    def __iter__(self) -> Iterator[_RowView]:
+        return (_RowView(self, x) for x in range(self.rows))
+
+    def _offset(self, key: Tuple[int, int]) -> int:
+        # Номер клетки в буфере; отрицательные индексы считаются с конца, как у списков
+        x, y = key
+        if x < 0:
+            x += self.rows
+        if y < 0:
+            y += self.cols
+        if not (0 <= x < self.rows and 0 <= y < self.cols):
+            raise IndexError(key)
+        return x * self.cols + y
+
+    @overload
+    def __getitem__(self, key: int) -> _RowView: ...
+
+    @overload
+    def __getitem__(self, key: Tuple[int, int]) -> str: ...
+
+    def __getitem__(self, key: Union[int, Tuple[int, int]]) -> Union[str, _RowView]:
+        if isinstance(key, tuple):
+            return _SYMBOLS[self.cells[self._offset(key)]]
+        if key < 0:
+            key += self.rows
+        if not 0 <= key < self.rows:
+            raise IndexError(key)
+        return _RowView(self, key)
+
+    def __setitem__(self, key: Tuple[int, int], value: str) -> None:
+        if self._shared:
+            self.cells = bytearray(self.cells)
+            self._shared = False
+        self.cells[self._offset(key)] = _CODES[value]
+        self.version += 1
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, MazeGrid):
+            return (self.rows, self.cols, self.cells) == (other.rows, other.cols, other.cells)
+        if isinstance(other, list):
+            return self.to_lists() == other
+        return NotImplemented
+
+    def row_view(self, x: int) -> memoryview:
+        """Коды клеток строки x без копирования, только для чтения"""
+        return memoryview(self.cells)[x * self.cols : (x + 1) * self.cols].toreadonly()
+
+    def copy(self) -> "MazeGrid":
+        """Копия, которая делит буфер с оригиналом до первой записи в любой из них"""
+        twin = MazeGrid(self.rows, self.cols, self.cells)
+        twin._shared = self._shared = True
+        return twin
+
+
+# Файл упакованного лабиринта: заголовок, затем по биту на клетку подряд по строкам
+# без выравнивания строк, 1 - проход или выход, 0 - стена
+_PACKED_HEADER = struct.Struct("<4s6I")
+_PACKED_MAGIC = b"MAZ1"
+_TO_BITS = bytes.maketrans(bytes([WALL, EMPTY, EXIT]), b"011")
+_FROM_BITS = bytes.maketrans(b"01", bytes([WALL, EMPTY]))
+
+
+def write_packed(
+    path: Union[str, "os.PathLike[str]"],
+    rows: int,
+    cols: int,
+    exits: Tuple[Tuple[int, int], Tuple[int, int]],
+    lines: Iterator[bytearray],
+) -> None:
+    """
+    Записать лабиринт из строк lines (коды клеток как в MazeGrid) в упакованный
+    файл. Строки пишутся по мере получения, в памяти меньше одной строки битов.
+    """
+    with open(path, "wb") as f:
+        f.write(_PACKED_HEADER.pack(_PACKED_MAGIC, rows, cols, *exits[0], *exits[1]))
+        pending = b""
+        for line in lines:
+            pending += bytes(line).translate(_TO_BITS)
+            whole = len(pending) // 8 * 8
+            if whole:
+                f.write(int(pending[:whole], 2).to_bytes(whole // 8, "big"))
+                pending = pending[whole:]
+        if pending:
+            f.write(int(pending.ljust(8, b"0"), 2).to_bytes(1, "big"))
+
+
+class PackedMaze:
+    """
+    Лабиринт из файла write_packed, отображённый в память. Строки
+    распаковываются по запросу, поэтому файл может быть больше памяти;
+    grid[x][y], len(grid) и get_exits работают как со списком списков.
+    """
+
+    __slots__ = ("rows", "cols", "exits", "_file", "_map")
+
+    def __init__(self, path: Union[str, "os.PathLike[str]"]) -> None:
+        self._file = open(path, "rb")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.rows, self.cols, *coords = _PACKED_HEADER.unpack_from(self._map)
+        if magic != _PACKED_MAGIC:
+            self.close()
+            raise ValueError(f"{path} is not a packed maze")
+        self.exits = [(coords[0], coords[1]), (coords[2], coords[3])]
+
+    def close(self) -> None:
+        self._map.close()
+        self._file.close()
+
+    def __enter__(self) -> "PackedMaze":
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        self.close()
+
+    def _codes(self, start: int, count: int) -> bytes:
+        # Коды клеток с номерами start..start + count - 1
+        first, last = start // 8, (start + count + 7) // 8
+        chunk = self._map[_PACKED_HEADER.size + first : _PACKED_HEADER.size + last]
+        bits = format(int.from_bytes(chunk, "big"), f"0{8 * len(chunk)}b").encode()
+        return bits[start - 8 * first : start - 8 * first + count].translate(_FROM_BITS)
+
+    def row_codes(self, x: int) -> bytearray:
+        """Коды клеток строки x, выходы отмечены EXIT"""
+        row = bytearray(self._codes(x * self.cols, self.cols))
+        for exit_x, exit_y in self.exits:
+            if exit_x == x:
+                row[exit_y] = EXIT
+        return row
+
+    def __len__(self) -> int:
+        return self.rows
+
+    def __getitem__(self, key: Union[int, Tuple[int, int]]) -> Union[str, List[str]]:
+        if isinstance(key, tuple):
+            return _SYMBOLS[self.row_codes(key[0])[key[1]]]
+        if not 0 <= key < self.rows:
+            raise IndexError(key)
+        return [_SYMBOLS[code] for code in self.row_codes(key)]
+
+    def passable(self) -> bytearray:
+        """Все клетки сразу: ненулевой байт - проход"""
+        return bytearray(self._codes(0, self.rows * self.cols))
+
+    def to_grid(self) -> MazeGrid:
+        grid = MazeGrid(self.rows, self.cols, self.passable())
+        for coord in self.exits:
+            grid[coord] = "X"
+        return grid
+
+    def to_lists(self) -> List[List[Union[str, int]]]:
+        return self.to_grid().to_lists()
+
+
+Maze = Union[List[List[Union[str, int]]], MazeGrid, PackedMaze]
+
 
 def create_grid(rows: int = 15, cols: int = 15) -> List[List[Union[str, int]]]:
     return [["■"] * cols for _ in range(rows)]
@@ -88,7 +322,253 @@ def bin_tree_maze(rows: int = 15, cols: int = 15, random_exit: bool = True) -> L
     return grid
 
 
-def get_exits(grid: List[List[Union[str, int]]]) -> List[Tuple[int, int]]:
+# Генераторы ниже работают с комнатами - клетками (2i + 1, 2j + 1) внутри рамки.
+# Комната номер r = i * n_cols + j, соседние комнаты разделяет одна клетка стены
+
+
+def _room_grid(rows: int, cols: int) -> Tuple[MazeGrid, int, int]:
+    """Сетка из одних комнат без проходов и число строк и столбцов комнат"""
+    grid = MazeGrid(rows, cols)
+    n_rows, n_cols = (rows - 1) // 2, (cols - 1) // 2
+    for i in range(n_rows):
+        start = (2 * i + 1) * cols + 1
+        grid.cells[start : start + 2 * n_cols : 2] = bytes([EMPTY]) * n_cols
+    return grid, n_rows, n_cols
+
+
+def _room_neighbours(room: int, n_rows: int, n_cols: int) -> List[int]:
+    i, j = divmod(room, n_cols)
+    neighbours = []
+    if i > 0:
+        neighbours.append(room - n_cols)
+    if i < n_rows - 1:
+        neighbours.append(room + n_cols)
+    if j > 0:
+        neighbours.append(room - 1)
+    if j < n_cols - 1:
+        neighbours.append(room + 1)
+    return neighbours
+
+
+def _join_rooms(grid: MazeGrid, n_cols: int, a: int, b: int) -> None:
+    # Стена лежит ровно посередине между клетками комнат
+    cell_a = (2 * (a // n_cols) + 1) * grid.cols + 2 * (a % n_cols) + 1
+    cell_b = (2 * (b // n_cols) + 1) * grid.cols + 2 * (b % n_cols) + 1
+    grid.cells[(cell_a + cell_b) // 2] = EMPTY
+
+
+def _bin_tree_rooms(rows: int, cols: int) -> MazeGrid:
+    # Двоичное дерево: из каждой комнаты проход вверх или вправо
+    grid, n_rows, n_cols = _room_grid(rows, cols)
+    for room in range(n_rows * n_cols):
+        i, j = divmod(room, n_cols)
+        if i > 0 and (j == n_cols - 1 or random() < 0.5):
+            _join_rooms(grid, n_cols, room, room - n_cols)
+        elif j < n_cols - 1:
+            _join_rooms(grid, n_cols, room, room + 1)
+    return grid
+
+
+def _dfs_rooms(rows: int, cols: int) -> MazeGrid:
+    # Поиск в глубину с явным стеком вместо рекурсии
+    grid, n_rows, n_cols = _room_grid(rows, cols)
+    if not n_rows or not n_cols:
+        return grid
+    visited = bytearray(n_rows * n_cols)
+    start = randrange(n_rows * n_cols)
+    visited[start] = 1
+    stack = [start]
+    while stack:
+        room = stack[-1]
+        fresh = [n for n in _room_neighbours(room, n_rows, n_cols) if not visited[n]]
+        if not fresh:
+            stack.pop()
+            continue
+        nxt = choice(fresh)
+        _join_rooms(grid, n_cols, room, nxt)
+        visited[nxt] = 1
+        stack.append(nxt)
+    return grid
+
+
+def _wilson_rooms(rows: int, cols: int) -> MazeGrid:
+    # Алгоритм Уилсона: случайные блуждания со стиранием петель до уже построенного дерева.
+    # Все лабиринты получаются равновероятными
+    grid, n_rows, n_cols = _room_grid(rows, cols)
+    total = n_rows * n_cols
+    if not total:
+        return grid
+    in_tree = bytearray(total)
+    in_tree[randrange(total)] = 1
+    # Куда блуждание ушло из комнаты в последний раз; так петли стираются сами
+    went = [0] * total
+    for start in range(total):
+        room = start
+        while not in_tree[room]:
+            went[room] = choice(_room_neighbours(room, n_rows, n_cols))
+            room = went[room]
+        room = start
+        while not in_tree[room]:
+            in_tree[room] = 1
+            _join_rooms(grid, n_cols, room, went[room])
+            room = went[room]
+    return grid
+
+
+def _find(parent: Union[List[int], Dict[int, int]], r: int) -> int:
+    # Корень множества в системе непересекающихся множеств со сжатием путей
+    while parent[r] != r:
+        parent[r] = parent[parent[r]]
+        r = parent[r]
+    return r
+
+
+def _kruskal_rooms(rows: int, cols: int) -> MazeGrid:
+    # Алгоритм Краскала: стены в случайном порядке, система непересекающихся множеств
+    grid, n_rows, n_cols = _room_grid(rows, cols)
+    walls = [(r, r + 1) for r in range(n_rows * n_cols) if r % n_cols < n_cols - 1]
+    walls += [(r, r + n_cols) for r in range(n_rows * n_cols - n_cols)]
+    shuffle(walls)
+    parent = list(range(n_rows * n_cols))
+    size = [1] * len(parent)
+    for a, b in walls:
+        root_a, root_b = _find(parent, a), _find(parent, b)
+        if root_a == root_b:
+            continue
+        if size[root_a] < size[root_b]:
+            root_a, root_b = root_b, root_a
+        parent[root_b] = root_a
+        size[root_a] += size[root_b]
+        _join_rooms(grid, n_cols, a, b)
+    return grid
+
+
+def eller_rows(rows: int, cols: int) -> Iterator[bytearray]:
+    """
+    Строки лабиринта алгоритмом Эллера по одной, коды клеток как в MazeGrid.
+    В памяти держится только текущая строка комнат: номера их множеств и
+    система множеств на этих номерах, то есть O(cols).
+    """
+    n_rows, n_cols = (rows - 1) // 2, (cols - 1) // 2
+    yield bytearray(cols)
+    labels = list(range(n_cols))
+    next_label = n_cols
+    for i in range(n_rows):
+        last = i == n_rows - 1
+        room_row = bytearray(cols)
+        room_row[1 : 2 * n_cols : 2] = bytes([EMPTY]) * n_cols
+        parent = {label: label for label in labels}
+
+        # Соединяем соседей из разных множеств, в последней строке - обязательно
+        for j in range(n_cols - 1):
+            a, b = _find(parent, labels[j]), _find(parent, labels[j + 1])
+            if a != b and (last or random() < 0.5):
+                parent[b] = a
+                room_row[2 * j + 2] = EMPTY
+        yield room_row
+
+        below = bytearray(cols)
+        if not last:
+            groups: Dict[int, List[int]] = {}
+            for j, label in enumerate(labels):
+                groups.setdefault(_find(parent, label), []).append(j)
+            # Из каждого множества хотя бы один проход вниз, остальные комнаты - новые множества
+            new_labels = []
+            for j in range(n_cols):
+                new_labels.append(next_label)
+                next_label += 1
+            for root, members in groups.items():
+                down = [j for j in members if random() < 0.5] or [choice(members)]
+                for j in down:
+                    below[2 * j + 1] = EMPTY
+                    new_labels[j] = root
+            labels = new_labels
+        yield below
+    for _ in range(rows - 1 - 2 * n_rows):
+        yield bytearray(cols)
+
+
+def _eller_rooms(rows: int, cols: int) -> MazeGrid:
+    return MazeGrid(rows, cols, bytearray().join(eller_rows(rows, cols)))
+
+
+GENERATORS: Dict[str, Callable[[int, int], MazeGrid]] = {
+    "bin_tree": _bin_tree_rooms,
+    "dfs": _dfs_rooms,
+    "wilson": _wilson_rooms,
+    "kruskal": _kruskal_rooms,
+    "eller": _eller_rooms,
+}
+
+
+def _border_exits(rows: int, cols: int) -> List[Tuple[int, int]]:
+    """Клетки рамки, примыкающие к комнате"""
+    exits = [(0, y) for y in range(1, cols - 1, 2)] + [(x, 0) for x in range(1, rows - 1, 2)]
+    if rows % 2:
+        exits += [(rows - 1, y) for y in range(1, cols - 1, 2)]
+    if cols % 2:
+        exits += [(x, cols - 1) for x in range(1, rows - 1, 2)]
+    return exits
+
+
+def generate_maze(rows: int = 15, cols: int = 15, algorithm: str = "dfs", random_exit: bool = True) -> MazeGrid:
+    """
+    Лабиринт алгоритмом из GENERATORS. В отличие от bin_tree_maze входы
+    выбираются только у комнат, поэтому лабиринт всегда проходим.
+    """
+    grid = GENERATORS[algorithm](rows, cols)
+    if random_exit:
+        coord_in = coord_out = choice(_border_exits(rows, cols))
+        while coord_in == coord_out:
+            coord_out = choice(_border_exits(rows, cols))
+    else:
+        coord_in, coord_out = (0, cols - 2), (rows - 1, 1)
+    grid[coord_in] = "X"
+    grid[coord_out] = "X"
+    return grid
+
+
+def stream_maze(
+    rows: int = 15, cols: int = 15, random_exit: bool = True
+) -> Tuple[Tuple[Tuple[int, int], Tuple[int, int]], Iterator[bytearray]]:
+    """
+    Выходы и строки лабиринта Эллера по одной. Выходы выбираются заранее,
+    поэтому строки можно сразу писать в write_packed.
+    """
+    if random_exit:
+        candidates = _border_exits(rows, cols)
+        coord_in = coord_out = choice(candidates)
+        while coord_in == coord_out:
+            coord_out = choice(candidates)
+    else:
+        coord_in, coord_out = (0, cols - 2), (rows - 1, 1)
+
+    def lines() -> Iterator[bytearray]:
+        for x, line in enumerate(eller_rows(rows, cols)):
+            for exit_x, exit_y in (coord_in, coord_out):
+                if exit_x == x:
+                    line[exit_y] = EXIT
+            yield line
+
+    return (coord_in, coord_out), lines()
+
+
+def save_packed_maze(path: Union[str, "os.PathLike[str]"], rows: int, cols: int, random_exit: bool = True) -> None:
+    """Сгенерировать лабиринт Эллера прямо в упакованный файл, не держа его в памяти"""
+    exits, lines = stream_maze(rows, cols, random_exit)
+    write_packed(path, rows, cols, exits, lines)
+
+
+def get_exits(grid: Maze) -> List[Tuple[int, int]]:
+    if isinstance(grid, PackedMaze):
+        return sorted(grid.exits)
+    if isinstance(grid, MazeGrid):
+        exits = []
+        i = grid.cells.find(EXIT)
+        while i != -1:
+            exits.append(divmod(i, grid.cols))
+            i = grid.cells.find(EXIT, i + 1)
+        return exits
     return [(x, y) for x, row in enumerate(grid) for y, cell in enumerate(row) if cell == "X"]
 
 
@@ -102,35 +582,38 @@ def make_step(grid: List[List[Union[str, int]]], k: int) -> List[List[Union[str,
     return grid
 
 
-def shortest_path(grid: List[List[Union[str, int]]], exit_coord: Tuple[int, int]) -> Optional[List[Tuple[int, int]]]:
-    path = [exit_coord]
-    cur_coord = exit_coord
-    cur_value = grid[cur_coord[0]][cur_coord[1]]
+def iter_shortest_path(grid: List[List[Union[str, int]]], exit_coord: Tuple[int, int]) -> Iterator[Tuple[int, int]]:
+    """
+    Клетки пути от exit_coord к клетке с номером 1 по сетке волнового
+    алгоритма, по одной. Из клетки с номером k идём в любую соседнюю с k - 1,
+    такая есть у каждой клетки волны, поэтому шагов ровно столько, сколько
+    клеток в пути. Сетка не меняется. ValueError, если путь оборвался.
+    """
+    rows, cols = len(grid), len(grid[0])
+    x, y = exit_coord
+    value = grid[x][y]
+    if not isinstance(value, int) or value < 1:
+        raise ValueError(f"{exit_coord} is not reached by the wave")
+    yield x, y
+    while value != 1:
+        for dx, dy in ((-1, 0), (1, 0), (0, -1), (0, 1)):
+            nx, ny = x + dx, y + dy
+            if 0 <= nx < rows and 0 <= ny < cols and grid[nx][ny] == value - 1:
+                break
+        else:
+            raise ValueError(f"no cell numbered {value - 1} next to {(x, y)}")
+        x, y, value = nx, ny, value - 1
+        yield x, y
 
-    if not isinstance(cur_value, int):
-        return None
 
-    while cur_value != 1:
-        neighbors = [(cur_coord[0] + dx, cur_coord[1] + dy)
-                     for dx, dy in [(-1, 0), (1, 0), (0, -1), (0, 1)]
-                     if 0 <= cur_coord[0] + dx < len(grid)
-                     and 0 <= cur_coord[1] + dy < len(grid[0])
-                     and grid[cur_coord[0] + dx][cur_coord[1] + dy] == cur_value - 1]
-        if not neighbors:
-            grid[cur_coord[0]][cur_coord[1]] = " "
-            path.pop()
-            if not path:
-                return None
-            cur_coord = path[-1]
-            cur_value = grid[cur_coord[0]][cur_coord[1]]
-        else:
-            cur_coord = neighbors[0]
-            cur_value = grid[cur_coord[0]][cur_coord[1]]
-            path.append(cur_coord)
-    return path
+def shortest_path(grid: List[List[Union[str, int]]], exit_coord: Tuple[int, int]) -> Optional[List[Tuple[int, int]]]:
+    try:
+        return list(iter_shortest_path(grid, exit_coord))
+    except ValueError:
+        return None
 
 
-def encircled_exit(grid: List[List[Union[str, int]]], coord: Tuple[int, int]) -> bool:
+def encircled_exit(grid: Maze, coord: Tuple[int, int]) -> bool:
     # Проверка на тупик
     x, y = coord
     free_neighbors = sum(
@@ -140,44 +623,667 @@ def encircled_exit(grid: List[List[Union[str, int]]], coord: Tuple[int, int]) ->
     return free_neighbors == 0
 
 
-def solve_maze(grid: List[List[Union[str, int]]]) -> Tuple[List[List[Union[str, int]]], Optional[List[Tuple[int, int]]]]:
-    exits = get_exits(grid)
-    if len(exits) != 2:
-        return grid, None
+Counters = Optional[Dict[str, int]]
 
-    for an_exit in exits:
-        if encircled_exit(grid, an_exit):
-            return grid, None
 
-    start_coord, end_coord = exits
-    q_grid = deepcopy(grid)
+def _solve_wave(
+    grid: Maze, start_coord: Tuple[int, int], end_coord: Tuple[int, int], counters: Counters = None
+) -> Optional[Iterator[Tuple[int, int]]]:
+    # Волновой алгоритм: на каждом шаге make_step ищет по всей сетке клетки с номером k
+    q_grid = grid.to_lists() if isinstance(grid, (MazeGrid, PackedMaze)) else deepcopy(grid)
     for r in range(len(q_grid)):
         for c in range(len(q_grid[0])):
             if q_grid[r][c] == " ":
                 q_grid[r][c] = 0
 
     q_grid[start_coord[0]][start_coord[1]] = 1
+    q_grid[end_coord[0]][end_coord[1]] = 0
 
     k = 1
     while q_grid[end_coord[0]][end_coord[1]] == 0:
         prev = deepcopy(q_grid)
         make_step(q_grid, k)
         if q_grid == prev:
-            return grid, None
+            break
         k += 1
 
-    path = shortest_path(q_grid, end_coord)
-    return grid, path
+    if counters is not None:
+        # Раскрыта каждая клетка, получившая номер волны
+        counters["expanded"] += sum(1 for row in q_grid for cell in row if isinstance(cell, int) and cell > 0)
+    if q_grid[end_coord[0]][end_coord[1]] == 0:
+        return None
+    return iter_shortest_path(q_grid, end_coord)
+
+
+def _passable(grid: Maze) -> Tuple[bytearray, int, int]:
+    # Плоский массив проходимости: ненулевой байт - клетка, по которой можно идти
+    if isinstance(grid, MazeGrid):
+        return grid.cells, grid.rows, grid.cols
+    if isinstance(grid, PackedMaze):
+        return grid.passable(), grid.rows, grid.cols
+    cells = bytearray(cell in (" ", "X") for row in grid for cell in row)
+    return cells, len(grid), len(grid[0])
+
+
+def trace_path(came: bytearray, cols: int, cur: int, stop: int) -> Iterator[Tuple[int, int]]:
+    """
+    Клетки от cur до stop включительно, по одной. came[i] - номер шага (1-4:
+    вверх, вниз, влево, вправо), которым поиск пришёл в клетку i; по нему
+    восстанавливается предыдущая клетка, так что работа пропорциональна длине
+    пути, а came не меняется.
+    """
+    steps = (0, -cols, cols, -1, 1, 0)
+    yield divmod(cur, cols)
+    while cur != stop:
+        cur -= steps[came[cur]]
+        yield divmod(cur, cols)
+
+
+def _solve_bfs(
+    grid: Maze, start_coord: Tuple[int, int], end_coord: Tuple[int, int], counters: Counters = None
+) -> Optional[Iterator[Tuple[int, int]]]:
+    # Поиск в ширину по плоскому массиву: каждая клетка попадает в очередь один раз.
+    # came[i] - номер шага, которым пришли в i (1-4), 5 у старта, 0 - клетка не посещена
+    passable, rows, cols = _passable(grid)
+    steps = (0, -cols, cols, -1, 1, 0)
+    came = bytearray(rows * cols)
+    start = start_coord[0] * cols + start_coord[1]
+    end = end_coord[0] * cols + end_coord[1]
+    came[start] = 5
+    queue = deque([start])
+    expanded = 0
+    while queue:
+        cur = queue.popleft()
+        expanded += 1
+        if cur == end:
+            break
+        y = cur % cols
+        for move, allowed in ((1, cur >= cols), (2, cur + cols < rows * cols), (3, y > 0), (4, y < cols - 1)):
+            nxt = cur + steps[move]
+            if allowed and not came[nxt] and passable[nxt]:
+                came[nxt] = move
+                queue.append(nxt)
+    if counters is not None:
+        counters["expanded"] += expanded
+    if not came[end]:
+        return None
+    return trace_path(came, cols, end, start)
+
+
+def _solve_astar(
+    grid: Maze, start_coord: Tuple[int, int], end_coord: Tuple[int, int], counters: Counters = None
+) -> Optional[Iterator[Tuple[int, int]]]:
+    # A* с манхэттенской эвристикой. В куче (f, -g, клетка): при равных f сначала
+    # более глубокие клетки, это быстрее выводит к цели в коридорах лабиринта
+    passable, rows, cols = _passable(grid)
+    steps = (0, -cols, cols, -1, 1, 0)
+    came = bytearray(rows * cols)
+    start = start_coord[0] * cols + start_coord[1]
+    end = end_coord[0] * cols + end_coord[1]
+    end_x, end_y = end_coord
+    came[start] = 5
+    best = {start: 0}
+    heap = [(abs(start_coord[0] - end_x) + abs(start_coord[1] - end_y), 0, start)]
+    expanded = 0
+    while heap:
+        _, neg_g, cur = heappop(heap)
+        g = -neg_g
+        if g > best[cur]:
+            continue
+        expanded += 1
+        if cur == end:
+            break
+        x, y = divmod(cur, cols)
+        for move, allowed in ((1, x > 0), (2, x < rows - 1), (3, y > 0), (4, y < cols - 1)):
+            nxt = cur + steps[move]
+            if allowed and passable[nxt] and g + 1 < best.get(nxt, rows * cols):
+                best[nxt] = g + 1
+                came[nxt] = move
+                nx, ny = divmod(nxt, cols)
+                heappush(heap, (g + 1 + abs(nx - end_x) + abs(ny - end_y), -g - 1, nxt))
+    if counters is not None:
+        counters["expanded"] += expanded
+    if end not in best:
+        return None
+    return trace_path(came, cols, end, start)
+
+
+def _solve_bidirectional(
+    grid: Maze, start_coord: Tuple[int, int], end_coord: Tuple[int, int], counters: Counters = None
+) -> Optional[Iterator[Tuple[int, int]]]:
+    # Поиск в ширину с двух концов по уровням, каждый раз расширяется меньший фронт.
+    # Уровень, на котором фронты встретились, досматривается до конца и из всех
+    # встреч берётся кратчайшая
+    passable, rows, cols = _passable(grid)
+    steps = (0, -cols, cols, -1, 1, 0)
+    start = start_coord[0] * cols + start_coord[1]
+    end = end_coord[0] * cols + end_coord[1]
+    came = (bytearray(rows * cols), bytearray(rows * cols))
+    depth: Tuple[Dict[int, int], Dict[int, int]] = ({start: 0}, {end: 0})
+    came[0][start] = came[1][end] = 5
+    fronts = [[start], [end]]
+    expanded = 0
+    meeting: Optional[Tuple[int, int]] = None
+    while fronts[0] and fronts[1] and meeting is None and start != end:
+        side = 0 if len(fronts[0]) <= len(fronts[1]) else 1
+        mine, other = depth[side], depth[1 - side]
+        nxt_front = []
+        for cur in fronts[side]:
+            expanded += 1
+            x, y = divmod(cur, cols)
+            for move, allowed in ((1, x > 0), (2, x < rows - 1), (3, y > 0), (4, y < cols - 1)):
+                nxt = cur + steps[move]
+                if not allowed or not passable[nxt]:
+                    continue
+                if nxt in other:
+                    length = mine[cur] + 1 + other[nxt]
+                    if meeting is None or length < meeting[0]:
+                        meeting = (length, cur if side == 0 else nxt)
+                if not came[side][nxt]:
+                    came[side][nxt] = move
+                    mine[nxt] = mine[cur] + 1
+                    nxt_front.append(nxt)
+        fronts[side] = nxt_front
+    if counters is not None:
+        counters["expanded"] += expanded
+    if start == end:
+        return iter([end_coord])
+    if meeting is None:
+        return None
+    # meeting[1] - последняя клетка со стороны старта, дальше шаг к клетке со стороны выхода
+    near = meeting[1]
+    far = [cell for cell in _neighbour_cells(near, rows, cols) if cell in depth[1]]
+    far_cell = min(far, key=depth[1].__getitem__)
+    to_end = list(trace_path(came[1], cols, far_cell, end))
+    return chain(reversed(to_end), trace_path(came[0], cols, near, start))
+
+
+def _neighbour_cells(cur: int, rows: int, cols: int) -> List[int]:
+    x, y = divmod(cur, cols)
+    cells = []
+    if x > 0:
+        cells.append(cur - cols)
+    if x < rows - 1:
+        cells.append(cur + cols)
+    if y > 0:
+        cells.append(cur - 1)
+    if y < cols - 1:
+        cells.append(cur + 1)
+    return cells
+
+
+ALGORITHMS: Dict[
+    str, Callable[[Maze, Tuple[int, int], Tuple[int, int], Counters], Optional[Iterator[Tuple[int, int]]]]
+] = {
+    "wave": _solve_wave,
+    "bfs": _solve_bfs,
+    "astar": _solve_astar,
+    "bidirectional": _solve_bidirectional,
+}
+
+
+@overload
+def solve_maze(
+    grid: Maze, algorithm: str = ..., counters: Counters = ..., lazy: Literal[False] = ...
+) -> Tuple[Maze, Optional[List[Tuple[int, int]]]]: ...
+
+
+@overload
+def solve_maze(
+    grid: Maze, algorithm: str = ..., counters: Counters = ..., *, lazy: Literal[True]
+) -> Tuple[Maze, Optional[Iterator[Tuple[int, int]]]]: ...
+
+
+def solve_maze(
+    grid: Maze, algorithm: str = "bfs", counters: Counters = None, lazy: bool = False
+) -> Tuple[Maze, Optional[Union[List[Tuple[int, int]], Iterator[Tuple[int, int]]]]]:
+    """
+    Путь между двумя выходами лабиринта от второго выхода к первому, как у
+    shortest_path, или None. algorithm - ключ ALGORITHMS; если передан словарь
+    counters, в counters["expanded"] прибавляется число раскрытых клеток.
+    С lazy=True путь отдаётся итератором и восстанавливается по мере чтения.
+    """
+    exits = get_exits(grid)
+    if len(exits) != 2:
+        return grid, None
+
+    for an_exit in exits:
+        if encircled_exit(grid, an_exit):
+            return grid, None
+
+    start_coord, end_coord = exits
+    if counters is not None:
+        counters.setdefault("expanded", 0)
+    path = ALGORITHMS[algorithm](grid, start_coord, end_coord, counters)
+    if path is None or lazy:
+        return grid, path
+    return grid, list(path)
+
+
+def _as_maze_grid(grid: Maze) -> MazeGrid:
+    if isinstance(grid, MazeGrid):
+        return grid
+    if isinstance(grid, PackedMaze):
+        return grid.to_grid()
+    return MazeGrid.from_lists(grid)
+
+
+class MazeRecord(NamedTuple):
+    """Результат решения одного лабиринта из пакета"""
+
+    number: int
+    path: Optional[List[Tuple[int, int]]]
+    seconds: float
+    expanded: int
+
+
+def _solve_maze_chunk(
+    name: Optional[str],
+    entries: List[Tuple[int, int, int, int]],
+    algorithm: str,
+    grids: Optional[List[MazeGrid]] = None,
+) -> List[MazeRecord]:
+    # entries - (номер, смещение в блоке, строки, столбцы). Без имени блока лабиринты берутся из grids.
+    # Воркеры пула делят resource_tracker с родителем, так что блок удалит только родитель
+    block = shared_memory.SharedMemory(name) if name is not None else None
+    records = []
+    try:
+        for i, (number, offset, rows, cols) in enumerate(entries):
+            if block is not None:
+                grid = MazeGrid(rows, cols, bytearray(block.buf[offset : offset + rows * cols]))  # type: ignore[index]
+            else:
+                assert grids is not None
+                grid = grids[i]
+            counters = {"expanded": 0}
+            began = time.perf_counter()
+            _, path = solve_maze(grid, algorithm, counters)
+            records.append(MazeRecord(number, path, time.perf_counter() - began, counters["expanded"]))
+    finally:
+        if block is not None:
+            block.close()
+    return records
+
+
+def _maze_chunks(grids: Iterable[Maze], chunk_cells: int) -> Iterator[Tuple[int, List[MazeGrid]]]:
+    # Лабиринты группируются по числу клеток: мелкие пачками, огромные по одному
+    chunk: List[MazeGrid] = []
+    cells = 0
+    start = 0
+    for number, grid in enumerate(grids):
+        maze_grid = _as_maze_grid(grid)
+        chunk.append(maze_grid)
+        cells += maze_grid.rows * maze_grid.cols
+        if cells >= chunk_cells:
+            yield start, chunk
+            start, chunk, cells = number + 1, [], 0
+    if chunk:
+        yield start, chunk
+
+
+def _solve_maze_records(
+    grids: Iterable[Maze], workers: Optional[int], chunk_cells: int, ordered: bool, algorithm: str
+) -> Iterator[MazeRecord]:
+    chunks = _maze_chunks(grids, chunk_cells)
+    if workers == 1:
+        for start, chunk in chunks:
+            entries = [(start + i, 0, grid.rows, grid.cols) for i, grid in enumerate(chunk)]
+            yield from _solve_maze_chunk(None, entries, algorithm, chunk)
+        return
+
+    workers = workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        max_pending = 2 * workers
+        pending: Dict[Future, Tuple[int, shared_memory.SharedMemory]] = {}
+        done_chunks: Dict[int, List[MazeRecord]] = {}
+        next_start = 0
+
+        def submit() -> bool:
+            batch = next(chunks, None)
+            if batch is None:
+                return False
+            start, chunk = batch
+            # Клетки всей пачки копируются в один блок общей памяти, в воркер уходят только смещения
+            block = shared_memory.SharedMemory(create=True, size=max(1, sum(g.rows * g.cols for g in chunk)))
+            entries = []
+            offset = 0
+            for i, grid in enumerate(chunk):
+                block.buf[offset : offset + len(grid.cells)] = grid.cells  # type: ignore[index]
+                entries.append((start + i, offset, grid.rows, grid.cols))
+                offset += len(grid.cells)
+            pending[pool.submit(_solve_maze_chunk, block.name, entries, algorithm)] = start, block
+            return True
+
+        try:
+            # Готовые пачки, ждущие медленную пачку перед ними, считаются вместе с
+            # пачками в работе, чтобы не копить пути и блоки общей памяти без предела
+            while len(pending) + len(done_chunks) < max_pending and submit():
+                pass
+            while pending:
+                finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    start, block = pending.pop(future)
+                    block.close()
+                    block.unlink()
+                    if ordered:
+                        done_chunks[start] = future.result()
+                    else:
+                        yield from future.result()
+                while ordered and next_start in done_chunks:
+                    records = done_chunks.pop(next_start)
+                    next_start += len(records)
+                    yield from records
+                while len(pending) + len(done_chunks) < max_pending and submit():
+                    pass
+        finally:
+            for _, block in pending.values():
+                block.close()
+                block.unlink()
+
+
+def solve_mazes(
+    grids: Iterable[Maze],
+    workers: Optional[int] = None,
+    chunk_cells: int = 1 << 20,
+    ordered: bool = True,
+    algorithm: str = "bfs",
+) -> Iterator[MazeRecord]:
+    """
+    Решить лабиринты в пуле процессов, как solve_maze каждый.
+
+    Лабиринты читаются из grids лениво и собираются в пачки примерно по
+    chunk_cells клеток: много мелких в одну пачку, огромный - сам по себе.
+    Клетки пачки кладутся в блок multiprocessing.shared_memory, воркеру
+    передаются только имя блока и смещения, сетки не сериализуются. В работе
+    не больше 2 * workers пачек. Результаты отдаются в порядке входа
+    (ordered=True) или по мере готовности, со временем решения и числом
+    раскрытых клеток. workers=1 решает в текущем процессе.
+    """
+    return _solve_maze_records(grids, workers, chunk_cells, ordered, algorithm)
+
 
+class MazeIndex:
+    """
+    Индекс для многих запросов пути по одному лабиринту.
 
-def add_path_to_grid(grid: List[List[Union[str, int]]], path: Optional[List[Tuple[int, int]]]) -> List[List[Union[str, int]]]:
+    Коридоры (клетки ровно с двумя проходными соседями) сжимаются в рёбра
+    графа развилок; узлы - развилки, тупики и выходы. Если граф - лес, как
+    в любом идеальном лабиринте, при построении он один раз подвешивается
+    за корни, и любой запрос идёт вверх от обоих концов до общего предка:
+    за время порядка длины пути, без обхода лабиринта. В лабиринте с
+    петлями для каждой стартовой клетки строится дерево кратчайших путей
+    (Дейкстра, вес ребра - длина коридора) и хранится в LRU-кэше на maxsize
+    деревьев, по 8 байт на узел; такое дерево строится дольше, чем один BFS
+    по лабиринту, и окупается только при повторных запросах из той же
+    клетки, например в nearest_exit. Индекс пересобирается, если MazeGrid
+    изменили через grid[x, y] = ...; лабиринт-список копируется при
+    построении и дальше не отслеживается.
+    """
+
+    def __init__(self, grid: Maze, maxsize: int = 64) -> None:
+        self.grid = _as_maze_grid(grid)
+        self.maxsize = maxsize
+        self.trees: "OrderedDict[int, Tuple[array, array]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self._build()
+
+    def _build(self) -> None:
+        grid = self.grid
+        cells = grid.cells
+        self._version = grid.version
+        self.trees.clear()
+        self.exits = get_exits(grid)
+        # Номера узлов по клеткам и клетки по номерам
+        self.node_of: Dict[int, int] = {}
+        self.nodes: List[int] = []
+        for cell in range(grid.rows * grid.cols):
+            if cells[cell] and (cells[cell] == EXIT or len(self._open(cell)) != 2):
+                self._add_node(cell)
+        # Рёбра: (узел, узел, клетки коридора от первого узла ко второму)
+        self.edges: List[Tuple[int, int, List[int]]] = []
+        self.edge_of: Dict[int, Tuple[int, int]] = {}
+        self.adjacent: List[List[Tuple[int, int, int]]] = [[] for _ in self.nodes]
+        for node in range(len(self.nodes)):
+            self._walk_corridors(node)
+        # Кольца без развилок: любая их клетка становится узлом
+        for cell in range(grid.rows * grid.cols):
+            if cells[cell] and cell not in self.node_of and cell not in self.edge_of:
+                self._add_node(cell)
+                self.adjacent.append([])
+                self._walk_corridors(len(self.nodes) - 1)
+        self._build_forest()
+
+    def _build_forest(self) -> None:
+        # Остовный лес графа: родитель узла, ребро к нему, расстояние в клетках
+        # от корня и корень компоненты. Если рёбер ровно столько, сколько в
+        # остовном лесу, граф сам лес и кратчайший путь - путь по этому лесу
+        count = len(self.nodes)
+        self.parent = array("i", [-1]) * count
+        self.up_edge = array("i", [-1]) * count
+        self.depth = array("i", [0]) * count
+        self.component = array("i", [-1]) * count
+        components = 0
+        for root in range(count):
+            if self.component[root] != -1:
+                continue
+            components += 1
+            self.component[root] = root
+            stack = [root]
+            while stack:
+                node = stack.pop()
+                for other, length, edge_id in self.adjacent[node]:
+                    if self.component[other] == -1:
+                        self.component[other] = root
+                        self.parent[other] = node
+                        self.up_edge[other] = edge_id
+                        self.depth[other] = self.depth[node] + length
+                        stack.append(other)
+        self.forest = len(self.edges) == count - components
+
+    def _add_node(self, cell: int) -> None:
+        self.node_of[cell] = len(self.nodes)
+        self.nodes.append(cell)
+
+    def _open(self, cell: int) -> List[int]:
+        cells = self.grid.cells
+        return [n for n in _neighbour_cells(cell, self.grid.rows, self.grid.cols) if cells[n]]
+
+    def _walk_corridors(self, node: int) -> None:
+        for first in self._open(self.nodes[node]):
+            if first in self.edge_of or self.node_of.get(first, node) < node:
+                continue
+            corridor = []
+            prev, cur = self.nodes[node], first
+            while cur not in self.node_of:
+                corridor.append(cur)
+                prev, cur = cur, next(n for n in self._open(cur) if n != prev)
+            other = self.node_of[cur]
+            edge_id = len(self.edges)
+            self.edges.append((node, other, corridor))
+            for i, cell in enumerate(corridor):
+                self.edge_of[cell] = (edge_id, i)
+            self.adjacent[node].append((other, len(corridor) + 1, edge_id))
+            if other != node:
+                self.adjacent[other].append((node, len(corridor) + 1, edge_id))
+
+    def invalidate(self) -> None:
+        """Пересобрать граф и сбросить кэш деревьев"""
+        self._build()
+
+    def _check(self) -> None:
+        if self.grid.version != self._version:
+            self._build()
+
+    def _tree(self, start: int, anchors: List[Tuple[int, List[int]]]) -> Tuple[array, array]:
+        # Расстояния от клетки start до узлов (-1 - недостижим) и ребро, по которому
+        # пришли в узел (-1 - узел-якорь start, до него идут по коридору start)
+        if start in self.trees:
+            self.hits += 1
+            self.trees.move_to_end(start)
+            return self.trees[start]
+        self.misses += 1
+        dist = array("i", [-1]) * len(self.nodes)
+        via = array("i", [-1]) * len(self.nodes)
+        heap = []
+        for node, head in anchors:
+            if dist[node] == -1 or len(head) - 1 < dist[node]:
+                dist[node] = len(head) - 1
+                heap.append((len(head) - 1, node))
+        heapify(heap)
+        while heap:
+            d, node = heappop(heap)
+            if d > dist[node]:
+                continue
+            for other, length, edge_id in self.adjacent[node]:
+                if dist[other] == -1 or d + length < dist[other]:
+                    dist[other] = d + length
+                    via[other] = edge_id
+                    heappush(heap, (d + length, other))
+        self.trees[start] = dist, via
+        if len(self.trees) > self.maxsize:
+            self.trees.popitem(last=False)
+        return dist, via
+
+    def _anchors(self, cell: int) -> List[Tuple[int, List[int]]]:
+        # Ближайшие узлы и клетки от cell до них, включая оба конца
+        if cell in self.node_of:
+            return [(self.node_of[cell], [cell])]
+        edge_id, i = self.edge_of[cell]
+        a, b, corridor = self.edges[edge_id]
+        return [(a, corridor[i::-1] + [self.nodes[a]]), (b, corridor[i:] + [self.nodes[b]])]
+
+    def _cell(self, coord: Tuple[int, int]) -> int:
+        cell = coord[0] * self.grid.cols + coord[1]
+        if not (0 <= coord[0] < self.grid.rows and 0 <= coord[1] < self.grid.cols) or not self.grid.cells[cell]:
+            raise ValueError(f"{coord} is a wall")
+        return cell
+
+    def _step(self, node: int, edge_id: int) -> Tuple[int, List[int]]:
+        # Узел на другом конце ребра и клетки от node до него, включая node
+        a, b, corridor = self.edges[edge_id]
+        if node == b:
+            return a, [self.nodes[node]] + corridor[::-1]
+        return b, [self.nodes[node]] + corridor
+
+    def _unwind(self, via: array, node: int) -> Tuple[List[int], int]:
+        # Клетки от node назад по рёбрам дерева до узла-якоря, без него, и сам якорь
+        cells: List[int] = []
+        while via[node] != -1:
+            node, step = self._step(node, via[node])
+            cells.extend(step)
+        return cells, node
+
+    def _ancestor(self, a: int, b: int) -> int:
+        # Общий предок узлов одной компоненты леса: поднимаемся от более далёкого от корня
+        depth, parent = self.depth, self.parent
+        while a != b:
+            if depth[a] >= depth[b]:
+                a = parent[a]
+            else:
+                b = parent[b]
+        return a
+
+    def _climb(self, node: int, top: int) -> List[int]:
+        # Клетки от node вверх по лесу до предка top, включая node и без top
+        cells: List[int] = []
+        while node != top:
+            node, step = self._step(node, self.up_edge[node])
+            cells.extend(step)
+        return cells
+
+    def path(self, start: Tuple[int, int], goal: Tuple[int, int]) -> Optional[List[Tuple[int, int]]]:
+        """Кратчайший путь от goal к start, как у solve_maze, или None, если пути нет"""
+        self._check()
+        s, g = self._cell(start), self._cell(goal)
+        best_length = -1
+        best: List[int] = []
+        if s in self.edge_of and g in self.edge_of and self.edge_of[s][0] == self.edge_of[g][0]:
+            (edge_id, i), (_, j) = self.edge_of[s], self.edge_of[g]
+            corridor = self.edges[edge_id][2]
+            best_length = abs(i - j)
+            best = corridor[j : i + 1] if j <= i else corridor[i : j + 1][::-1]
+        start_anchors, goal_anchors = self._anchors(s), self._anchors(g)
+        if self.forest:
+            # Концы коридоров обоих клеток, не больше четырёх пар, путь по лесу через общего предка
+            route = None
+            for a, head in start_anchors:
+                for b, tail in goal_anchors:
+                    if self.component[a] != self.component[b]:
+                        continue
+                    top = self._ancestor(a, b)
+                    length = len(head) - 1 + self.depth[a] + self.depth[b] - 2 * self.depth[top] + len(tail) - 1
+                    if best_length == -1 or length < best_length:
+                        best_length, route = length, (a, head, b, tail, top)
+            if route is not None:
+                a, head, b, tail, top = route
+                # Клетки от b до a без a: вверх от b до предка, затем вниз до a
+                middle = (self._climb(b, top) + [self.nodes[top]] + self._climb(a, top)[::-1])[:-1]
+                best = tail[:-1] + middle + head[::-1]
+        else:
+            # Одно дерево от самой клетки start: оба конца её коридора - источники с расстоянием по коридору
+            dist, via = self._tree(s, start_anchors)
+            heads = {node: head for node, head in start_anchors if len(head) - 1 == dist[node]}
+            for b, tail in goal_anchors:
+                if dist[b] == -1:
+                    continue
+                length = dist[b] + len(tail) - 1
+                if best_length != -1 and best_length <= length:
+                    continue
+                best_length = length
+                cells, anchor = self._unwind(via, b)
+                # best хранится от goal к start
+                best = tail[:-1] + cells + heads[anchor][::-1]
+        if best_length == -1:
+            return None
+        return [divmod(cell, self.grid.cols) for cell in best]
+
+    def distance(self, start: Tuple[int, int], goal: Tuple[int, int]) -> Optional[int]:
+        """Число шагов между клетками или None"""
+        path = self.path(start, goal)
+        return len(path) - 1 if path is not None else None
+
+    def nearest_exit(self, coord: Tuple[int, int]) -> Optional[List[Tuple[int, int]]]:
+        """Путь от ближайшего к coord выхода до coord (сама coord выходом не считается)"""
+        self._check()
+        paths = [self.path(coord, an_exit) for an_exit in self.exits if an_exit != coord]
+        found = [path for path in paths if path is not None]
+        return min(found, key=len) if found else None
+
+
+def add_path_to_grid(grid: Maze, path: Optional[List[Tuple[int, int]]]) -> Maze:
+    if isinstance(grid, PackedMaze):
+        # Файл открыт только для чтения, путь рисуется на копии в памяти
+        grid = grid.to_grid()
+    if isinstance(grid, MazeGrid):
+        for coord in path or []:
+            grid[coord] = "X"
+        return grid
     if path:
         for x, y in path:
             grid[x][y] = "X"
     return grid
 
 
-if __name__ == "__main__":
+if __name__ == "__main__" and len(sys.argv) > 1:
+    # python maze.py save FILE ROWS COLS - записать огромный лабиринт в файл
+    # python maze.py solve FILE - решить лабиринт из файла
+    # python maze.py batch COUNT SIZE [WORKERS] - решить пакет лабиринтов в пуле процессов
+    if sys.argv[1] == "batch":
+        COUNT, SIZE = int(sys.argv[2]), int(sys.argv[3])
+        WORKERS = int(sys.argv[4]) if len(sys.argv) > 4 else None
+        GRIDS = [generate_maze(SIZE, SIZE) for _ in range(COUNT)]
+        STARTED = time.perf_counter()
+        RECORDS = list(solve_mazes(GRIDS, workers=WORKERS))
+        ELAPSED = time.perf_counter() - STARTED
+        SOLVED = sum(1 for record in RECORDS if record.path)
+        print(f"{SOLVED}/{COUNT} mazes {SIZE}x{SIZE} in {ELAPSED:.2f}s, {COUNT * SIZE * SIZE / ELAPSED:.0f} cells/s")
+    elif sys.argv[1] == "save":
+        save_packed_maze(sys.argv[2], int(sys.argv[3]), int(sys.argv[4]))
+    else:
+        with PackedMaze(sys.argv[2]) as PACKED:
+            _, PATH = solve_maze(PACKED)
+            print(f"{PACKED.rows}x{PACKED.cols}: path of {len(PATH) if PATH else 0} cells")
+elif __name__ == "__main__":
     GRID = bin_tree_maze(15, 15)
     print(pd.DataFrame(GRID))
     _, PATH = solve_maze(GRID)
@@ -1,32 +1,193 @@
+import time
 import tkinter as tk
 from tkinter import messagebox, ttk
-from typing import List
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
 
-from maze import add_path_to_grid, bin_tree_maze, solve_maze
+from maze import (
+    EMPTY,
+    EXIT,
+    WALL,
+    Maze,
+    MazeGrid,
+    PackedMaze,
+    bin_tree_maze,
+    solve_maze,
+)
 
 CELL_SIZE = 10
 
+# Цвета клеток по кодам MazeGrid и цвет пути
+COLORS = {WALL: (0, 0, 0), EMPTY: (255, 255, 255), EXIT: (128, 0, 128)}
+PATH_RGB = (128, 0, 128)
+PATH_COLOR = "#%02x%02x%02x" % PATH_RGB
+# Код клетки пути в картинке, рядом с кодами MazeGrid
+_PATH = 3
 
-def draw_cell(x, y, color, size: int = CELL_SIZE):
-    x *= size
-    y *= size
-    canvas.create_rectangle(x, y, x + size, y + size, fill=color)
 
+def render_ppm(
+    grid: MazeGrid,
+    top: int,
+    left: int,
+    rows: int,
+    cols: int,
+    scale: int = 1,
+    stride: int = 1,
+    path: Iterable[Tuple[int, int]] = (),
+) -> bytes:
+    """
+    Картинка PPM (P6) с клетками grid начиная с (top, left): rows x cols
+    клеток с шагом stride, каждая клетка - квадрат scale x scale пикселей,
+    клетки path закрашены цветом пути. Строки собираются через
+    bytes.translate и срезы, без цикла по клеткам.
+    """
+    colors = {**COLORS, _PATH: PATH_RGB}
+    planes = [bytes.maketrans(bytes(colors), bytes(color[i] for color in colors.values())) for i in range(3)]
+    rows = min(rows, (grid.rows - top + stride - 1) // stride)
+    cols = min(cols, (grid.cols - left + stride - 1) // stride)
+    marks: Dict[int, List[int]] = {}
+    for x, y in path:
+        (row, row_rest), (col, col_rest) = divmod(x - top, stride), divmod(y - left, stride)
+        if not row_rest and not col_rest and 0 <= row < rows and 0 <= col < cols:
+            marks.setdefault(x, []).append(col)
+    width = cols * scale
+    lines = []
+    for x in range(top, top + rows * stride, stride):
+        codes = bytes(grid.row_view(x)[left : left + cols * stride : stride])
+        if x in marks:
+            marked = bytearray(codes)
+            for j in marks[x]:
+                marked[j] = _PATH
+            codes = bytes(marked)
+        if scale > 1:
+            wide = bytearray(width)
+            for k in range(scale):
+                wide[k::scale] = codes
+            codes = bytes(wide)
+        pixels = bytearray(3 * width)
+        for i in range(3):
+            pixels[i::3] = codes.translate(planes[i])
+        lines.append(bytes(pixels) * scale)
+    return b"P6 %d %d 255\n" % (width, len(lines) * scale) + b"".join(lines)
 
-def draw_maze(grid: List[List[str]], size: int = CELL_SIZE):
-    canvas.delete("all")
-    for x, row in enumerate(grid):
-        for y, cell in enumerate(row):
-            color = "white" if cell == " " else "black" if cell == "■" else "purple"
-            draw_cell(y, x, color, size)
+
+class MazeView:
+    """
+    Лабиринт на холсте одной картинкой PhotoImage. Картинка видимой части
+    перерисовывается только при сдвиге и масштабе, путь рисуется поверх неё
+    по клеткам: set_path меняет лишь клетки, вошедшие в путь или вышедшие из
+    него. Длительность последней перерисовки в миллисекундах - frame_ms, она
+    же передаётся в on_frame.
+    """
+
+    def __init__(
+        self,
+        canvas: tk.Canvas,
+        grid: Maze,
+        scale: int = CELL_SIZE,
+        on_frame: Optional[Callable[[float], None]] = None,
+    ) -> None:
+        self.canvas = canvas
+        if isinstance(grid, MazeGrid):
+            self.grid = grid
+        elif isinstance(grid, PackedMaze):
+            self.grid = grid.to_grid()
+        else:
+            self.grid = MazeGrid.from_lists(grid)
+        self.scale = scale
+        self.stride = 1
+        self.top = 0
+        self.left = 0
+        self.path: Set[Tuple[int, int]] = set()
+        self.on_frame = on_frame
+        self.frame_ms = 0.0
+        # Сколько клеток помещается в холст, считается при перерисовке
+        self.window = (0, 0)
+        self.image = tk.PhotoImage()
+        self.item = canvas.create_image(0, 0, image=self.image, anchor="nw")
+        canvas.bind("<Configure>", lambda _: self.redraw())
+        canvas.bind("<ButtonPress-1>", self._drag_start)
+        canvas.bind("<B1-Motion>", self._drag)
+        canvas.bind("<MouseWheel>", lambda event: self.zoom(1 if event.delta > 0 else -1))
+        canvas.bind("<Button-4>", lambda _: self.zoom(1))
+        canvas.bind("<Button-5>", lambda _: self.zoom(-1))
+        self._drag_from = (0, 0)
+
+    def _frame(self, started: float) -> None:
+        self.frame_ms = (time.perf_counter() - started) * 1000
+        if self.on_frame is not None:
+            self.on_frame(self.frame_ms)
+
+    def _visible(self) -> Tuple[int, int]:
+        # Сколько клеток (с учётом stride) помещается в холст
+        width = max(self.canvas.winfo_width(), 1)
+        height = max(self.canvas.winfo_height(), 1)
+        return -(-height // self.scale), -(-width // self.scale)
+
+    def redraw(self) -> None:
+        """Перерисовать видимую часть лабиринта вместе с путём одной картинкой"""
+        started = time.perf_counter()
+        self.window = rows, cols = self._visible()
+        self.image.configure(
+            data=render_ppm(self.grid, self.top, self.left, rows, cols, self.scale, self.stride, self.path)
+        )
+        self._frame(started)
+
+    def _paint(self, coord: Tuple[int, int], color: str) -> None:
+        x, y = coord
+        if (x - self.top) % self.stride or (y - self.left) % self.stride:
+            return
+        row, col = (x - self.top) // self.stride, (y - self.left) // self.stride
+        rows, cols = self.window
+        if 0 <= row < rows and 0 <= col < cols:
+            size = self.scale
+            self.image.put(color, to=(col * size, row * size, (col + 1) * size, (row + 1) * size))
+
+    def set_path(self, path: Optional[List[Tuple[int, int]]]) -> None:
+        """Показать путь, перерисовав только изменившиеся клетки"""
+        started = time.perf_counter()
+        new_path = set(path or [])
+        for coord in self.path - new_path:
+            self._paint(coord, "#%02x%02x%02x" % COLORS[self.grid.cells[coord[0] * self.grid.cols + coord[1]]])
+        for coord in new_path - self.path:
+            self._paint(coord, PATH_COLOR)
+        self.path = new_path
+        self._frame(started)
+
+    def pan(self, rows: int, cols: int) -> None:
+        """Сдвинуть вид на rows x cols клеток"""
+        self.top = min(max(self.top + rows, 0), max(self.grid.rows - 1, 0))
+        self.left = min(max(self.left + cols, 0), max(self.grid.cols - 1, 0))
+        self.redraw()
+
+    def zoom(self, steps: int) -> None:
+        """Приблизить (steps > 0) или отдалить: сначала растёт scale, после 1 пикселя на клетку - stride"""
+        for _ in range(abs(steps)):
+            if steps > 0:
+                if self.stride > 1:
+                    self.stride //= 2
+                else:
+                    self.scale = min(self.scale * 2, 64)
+            elif self.scale > 1:
+                self.scale //= 2
+            else:
+                self.stride = min(self.stride * 2, max(self.grid.rows, self.grid.cols))
+        self.redraw()
+
+    def _drag_start(self, event: tk.Event) -> None:
+        self._drag_from = (event.x, event.y)
+
+    def _drag(self, event: tk.Event) -> None:
+        cell = self.scale
+        dx, dy = (self._drag_from[0] - event.x) // cell, (self._drag_from[1] - event.y) // cell
+        if dx or dy:
+            self._drag_from = (self._drag_from[0] - dx * cell, self._drag_from[1] - dy * cell)
+            self.pan(dy * self.stride, dx * self.stride)
 
 
 def show_solution():
-    maze_copy, path = solve_maze(GRID)
-    maze_copy = add_path_to_grid(GRID, path)
-    if path:
-        draw_maze(maze_copy, CELL_SIZE)
-    else:
+    _, path = solve_maze(GRID)
+    VIEW.set_path(path)
+    if not path:
         messagebox.showinfo("Message", "No solution")
 
 
@@ -43,9 +204,21 @@ if __name__ == "__main__":
     window.geometry(f"{M * CELL_SIZE + 100}x{N * CELL_SIZE + 100}")
 
     canvas = tk.Canvas(window, width=M * CELL_SIZE, height=N * CELL_SIZE)
-    canvas.pack()
+    canvas.pack(fill="both", expand=True)
+
+    frame_label = ttk.Label(window, text="")
+
+    def report_frame(ms: float) -> None:
+        frame_label.configure(text=f"frame {ms:.1f} ms")
 
-    draw_maze(GRID, CELL_SIZE)
-    ttk.Button(window, text="Solve", command=show_solution).pack(pady=20)
+    VIEW = MazeView(canvas, GRID, CELL_SIZE, on_frame=report_frame)
+    window.bind("<Left>", lambda _: VIEW.pan(0, -5))
+    window.bind("<Right>", lambda _: VIEW.pan(0, 5))
+    window.bind("<Up>", lambda _: VIEW.pan(-5, 0))
+    window.bind("<Down>", lambda _: VIEW.pan(5, 0))
+    window.bind("<plus>", lambda _: VIEW.zoom(1))
+    window.bind("<minus>", lambda _: VIEW.zoom(-1))
+    ttk.Button(window, text="Solve", command=show_solution).pack(pady=10)
+    frame_label.pack()
 
     window.mainloop()
@@ -0,0 +1,57 @@
+from typing import Optional, Tuple
+
+import maze
+import numpy as np
+
+
+def _pick_exit(rng: np.random.Generator, rows: int, cols: int) -> Tuple[int, int]:
+    # Номер клетки в том же списке кандидатов, что и в maze.bin_tree_maze, но без самого списка
+    i = int(rng.integers(2 * (rows + cols)))
+    if i < cols:
+        return 0, i
+    if i < 2 * cols:
+        return rows - 1, i - cols
+    if i < 2 * cols + rows:
+        return i - 2 * cols, 0
+    return i - 2 * cols - rows, cols - 1
+
+
+def bin_tree_maze(
+    rows: int = 15, cols: int = 15, random_exit: bool = True, rng: Optional[np.random.Generator] = None
+) -> maze.MazeGrid:
+    """
+    Лабиринт алгоритмом двоичного дерева, как maze.bin_tree_maze, но все клетки
+    прорубаются сразу по одному случайному массиву. При одинаковом seed
+    генератора rng получается одинаковый лабиринт.
+    >>> a = bin_tree_maze(11, 11, rng=np.random.default_rng(1))
+    >>> a == bin_tree_maze(11, 11, rng=np.random.default_rng(1))
+    True
+    """
+    if rng is None:
+        rng = np.random.default_rng()
+    grid = maze.MazeGrid(rows, cols)
+    cells = np.frombuffer(grid.cells, dtype=np.uint8).reshape(rows, cols)
+    cells[1::2, 1::2] = maze.EMPTY
+
+    xs = np.arange(1, rows, 2)[:, None]
+    ys = np.arange(1, cols, 2)[None, :]
+    can_go_up = xs > 1
+    can_go_right = ys < cols - 2
+    up = rng.random((xs.shape[0], ys.shape[1])) < 0.5
+    # Вверх, если выпало вверх или направо нельзя, иначе направо, если можно
+    carve_up = can_go_up & (up | ~can_go_right)
+    carve_right = can_go_right & ~carve_up
+    cells[0 : 2 * xs.shape[0] : 2, 1::2] |= carve_up.view(np.uint8)
+    right = cells[1::2, 2::2]
+    right |= carve_right[:, : right.shape[1]].view(np.uint8)
+
+    if random_exit:
+        coord_in = _pick_exit(rng, rows, cols)
+        coord_out = _pick_exit(rng, rows, cols)
+        while coord_in == coord_out:
+            coord_out = _pick_exit(rng, rows, cols)
+    else:
+        coord_in, coord_out = (0, cols - 2), (rows - 1, 1)
+    cells[coord_in] = maze.EXIT
+    cells[coord_out] = maze.EXIT
+    return grid
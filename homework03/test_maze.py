@@ -1,8 +1,18 @@
+import os
+import tempfile
+import time
 import unittest
 from random import seed
+from unittest import mock
 import maze
 
 
+def _slow_first_chunk(name, entries, algorithm, grids=None, solve_chunk=maze._solve_maze_chunk):
+    if entries[0][0] == 0:
+        time.sleep(1)
+    return solve_chunk(name, entries, algorithm, grids)
+
+
 class MazeTest(unittest.TestCase):
     def test_remove_wall(self):
         seed(2)
@@ -109,6 +119,187 @@ class MazeTest(unittest.TestCase):
         expected_path = [(3, 3), (2, 3), (1, 3), (1, 2), (1, 1)]
         self.assertEqual(expected_path, maze.shortest_path(grid, exit_coord))
 
+    def test_solve_maze_algorithms(self):
+        for i in range(20):
+            seed(i)
+            grid = maze.bin_tree_maze(11, 15)
+            _, expected = maze.solve_maze(grid, algorithm="wave")
+            for algorithm in maze.ALGORITHMS:
+                _, path_ = maze.solve_maze(grid, algorithm=algorithm)
+                if expected is None:
+                    self.assertIsNone(path_)
+                    continue
+                self.assertEqual(len(expected), len(path_))
+                self.assertEqual((expected[0], expected[-1]), (path_[0], path_[-1]))
+                for (x1, y1), (x2, y2) in zip(path_, path_[1:]):
+                    self.assertEqual(1, abs(x1 - x2) + abs(y1 - y2))
+                    self.assertNotEqual("■", grid[x2][y2])
+
+    def test_maze_grid(self):
+        seed(3)
+        lists = maze.bin_tree_maze(11, 15)
+        grid = maze.MazeGrid.from_lists(lists)
+        self.assertEqual(lists, grid.to_lists())
+        self.assertEqual(lists[1][1], grid[1][1])
+        self.assertEqual(maze.get_exits(lists), maze.get_exits(grid))
+        self.assertEqual(maze.solve_maze(lists)[1], maze.solve_maze(grid)[1])
+
+        twin = grid.copy()
+        self.assertIs(grid.cells, twin.cells)
+        twin[1, 1] = "■"
+        self.assertIsNot(grid.cells, twin.cells)
+        self.assertEqual(" ", grid[1, 1])
+        self.assertEqual("■", twin[1][1])
+        self.assertEqual(lists, grid)
+
+        # Индексы за краем строки не переходят на соседнюю строку
+        self.assertEqual(lists[1][-1], grid[1][-1])
+        self.assertEqual(lists[-1][2], grid[-1, 2])
+        self.assertRaises(IndexError, grid[1].__getitem__, 15)
+        self.assertRaises(IndexError, grid.__getitem__, (1, -16))
+        self.assertRaises(IndexError, twin.__setitem__, (0, 15), " ")
+        self.assertRaises(IndexError, grid.__getitem__, 11)
+
+    def test_generators(self):
+        for algorithm in maze.GENERATORS:
+            for rows, cols in [(11, 15), (12, 9), (3, 3)]:
+                seed(rows)
+                grid = maze.generate_maze(rows, cols, algorithm=algorithm)
+                self.assertEqual((rows, cols), (len(grid), len(grid[0])))
+                # Идеальный лабиринт - дерево: проходов на один меньше, чем комнат
+                rooms = ((rows - 1) // 2) * ((cols - 1) // 2)
+                self.assertEqual(2 * rooms - 1, grid.cells.count(maze.EMPTY))
+                self.assertEqual(2, len(maze.get_exits(grid)))
+                self.assertIsNotNone(maze.solve_maze(grid)[1])
+
+    def test_packed_maze(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "maze.bin")
+            seed(5)
+            maze.save_packed_maze(path, 13, 21)
+            seed(5)
+            exits, lines = maze.stream_maze(13, 21)
+            expected = maze.MazeGrid(13, 21, bytearray().join(lines))
+            with maze.PackedMaze(path) as packed:
+                self.assertEqual(os.path.getsize(path), 28 + (13 * 21 + 7) // 8)
+                self.assertEqual(expected, packed.to_grid())
+                self.assertEqual(expected.to_lists()[3], packed[3])
+                self.assertEqual(sorted(exits), maze.get_exits(packed))
+                self.assertEqual(maze.solve_maze(expected)[1], maze.solve_maze(packed)[1])
+                self.assertEqual(maze.solve_maze(expected)[1], maze.solve_maze(packed, algorithm="wave")[1])
+
+    def test_solve_maze_counters(self):
+        # Открытое поле с петлями: все алгоритмы находят путь одной длины
+        grid = [["■"] * 9] + [["■"] + [" "] * 7 + ["■"] for _ in range(7)] + [["■"] * 9]
+        grid[0][1] = grid[8][7] = "X"
+        lengths = set()
+        expanded = {}
+        for algorithm in maze.ALGORITHMS:
+            counters = {}
+            _, path_ = maze.solve_maze(grid, algorithm=algorithm, counters=counters)
+            lengths.add(len(path_))
+            expanded[algorithm] = counters["expanded"]
+            self.assertEqual([(8, 7), (0, 1)], [path_[0], path_[-1]])
+        self.assertEqual({15}, lengths)
+        self.assertLess(expanded["astar"], expanded["bfs"])
+        self.assertLess(expanded["bidirectional"], expanded["bfs"])
+
+    def test_maze_index(self):
+        seed(9)
+        grid = maze.generate_maze(21, 31, algorithm="kruskal")
+        # Несколько петель и третий выход
+        for x, y in [(2, 5), (6, 11), (10, 20), (15, 26)]:
+            grid[x, y] = " "
+        grid[9, 0] = "X"
+        index = maze.MazeIndex(grid, maxsize=4)
+        self.assertFalse(index.forest)
+        free = [divmod(i, grid.cols) for i, cell in enumerate(grid.cells) if cell]
+        for i in range(100):
+            start, goal = free[i * 7 % len(free)], free[i * 13 % len(free)]
+            path_ = index.path(start, goal)
+            self.assertEqual(len(list(maze.ALGORITHMS["bfs"](grid, start, goal))), len(path_))
+            self.assertEqual((goal, start), (path_[0], path_[-1]))
+            for (x1, y1), (x2, y2) in zip(path_, path_[1:]):
+                self.assertEqual(1, abs(x1 - x2) + abs(y1 - y2))
+        self.assertLessEqual(len(index.trees), 4)
+        self.assertEqual(3, len(index.exits))
+
+        nearest = index.nearest_exit((1, 1))
+        self.assertIn(nearest[0], index.exits)
+        self.assertEqual(min(index.distance((1, 1), e) for e in index.exits), len(nearest) - 1)
+
+        # Замуровали выход - индекс пересобирается сам
+        self.assertEqual((9, 0), index.nearest_exit((9, 1))[0])
+        grid[9, 0] = "■"
+        self.assertNotEqual((9, 0), index.nearest_exit((9, 1))[0])
+        self.assertEqual(2, len(index.exits))
+        with self.assertRaises(ValueError):
+            index.path((9, 0), (1, 1))
+
+    def test_maze_index_perfect_maze(self):
+        seed(12)
+        grid = maze.generate_maze(41, 31, algorithm="dfs")
+        index = maze.MazeIndex(grid)
+        # В идеальном лабиринте запросы идут по лесу, деревья Дейкстры не строятся
+        self.assertTrue(index.forest)
+        free = [divmod(i, grid.cols) for i, cell in enumerate(grid.cells) if cell]
+        for i in range(200):
+            start, goal = free[i * 11 % len(free)], free[i * 17 % len(free)]
+            path_ = index.path(start, goal)
+            self.assertEqual(len(list(maze.ALGORITHMS["bfs"](grid, start, goal))), len(path_))
+            self.assertEqual((goal, start), (path_[0], path_[-1]))
+            for (x1, y1), (x2, y2) in zip(path_, path_[1:]):
+                self.assertEqual(1, abs(x1 - x2) + abs(y1 - y2))
+        self.assertEqual(0, index.misses)
+
+    def test_shortest_path_keeps_grid(self):
+        grid = [
+            ["■", "■", "■", "■", "■"],
+            ["■", 1, 2, 3, "■"],
+            ["■", 2, "■", 4, "■"],
+            ["■", 3, 4, 5, "■"],
+            ["■", "■", "■", "■", "■"],
+        ]
+        before = [row[:] for row in grid]
+        self.assertEqual(5, len(maze.shortest_path(grid, (3, 3))))
+        self.assertEqual(before, grid)
+        self.assertIsNone(maze.shortest_path(grid, (0, 0)))
+
+        seed(4)
+        grid = maze.generate_maze(31, 31)
+        _, lazy = maze.solve_maze(grid, lazy=True)
+        self.assertEqual(maze.get_exits(grid)[1], next(lazy))
+        for algorithm in maze.ALGORITHMS:
+            _, path_ = maze.solve_maze(grid, algorithm=algorithm)
+            self.assertEqual(path_, list(maze.solve_maze(grid, algorithm=algorithm, lazy=True)[1]))
+
+    def test_solve_mazes(self):
+        seed(6)
+        grids = [maze.generate_maze(21, 25) for _ in range(6)] + [maze.bin_tree_maze(15, 15)]
+        expected = [maze.solve_maze(grid)[1] for grid in grids]
+        records = list(maze.solve_mazes(grids, workers=2, chunk_cells=1000))
+        self.assertEqual(list(range(7)), [record.number for record in records])
+        self.assertEqual(expected, [record.path for record in records])
+        self.assertTrue(all(record.expanded > 0 for record in records if record.path))
+        unordered = maze.solve_mazes(grids, workers=2, ordered=False, chunk_cells=1)
+        self.assertEqual(expected, [record.path for record in sorted(unordered)])
+
+    def test_solve_mazes_slow_first_chunk(self):
+        seed(7)
+        taken = []
+
+        def grids():
+            for number in range(30):
+                taken.append(number)
+                yield maze.generate_maze(11, 11)
+
+        with mock.patch.object(maze, "_solve_maze_chunk", _slow_first_chunk):
+            records = maze.solve_mazes(grids(), workers=2, chunk_cells=1)
+            self.assertEqual(0, next(records).number)
+            # Пока первая пачка считается, готовые пачки за ней не копятся
+            self.assertLessEqual(len(taken), 4)
+            self.assertEqual(list(range(1, 30)), [record.number for record in records])
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,25 @@
+import unittest
+
+import maze
+import maze_numpy
+import numpy as np
+
+
+class BinTreeMazeTest(unittest.TestCase):
+    def test_same_seed_same_maze(self):
+        grid = maze_numpy.bin_tree_maze(21, 31, rng=np.random.default_rng(7))
+        self.assertEqual(grid, maze_numpy.bin_tree_maze(21, 31, rng=np.random.default_rng(7)))
+        self.assertNotEqual(grid, maze_numpy.bin_tree_maze(21, 31, rng=np.random.default_rng(8)))
+        self.assertEqual(2, len(maze.get_exits(grid)))
+
+    def test_spanning_tree(self):
+        for seed in range(10):
+            grid = maze_numpy.bin_tree_maze(21, 31, random_exit=False, rng=np.random.default_rng(seed))
+            # 10 x 15 комнат соединены 149 проходами, как в любом дереве
+            self.assertEqual(150 + 149, grid.cells.count(maze.EMPTY))
+            self.assertIsNotNone(maze.solve_maze(grid)[1])
+            self.assertEqual(grid.to_lists(), maze.MazeGrid.from_lists(grid.to_lists()).to_lists())
+
+
+if __name__ == "__main__":
+    unittest.main()
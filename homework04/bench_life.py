@@ -0,0 +1,77 @@
+import os
+import random
+import sys
+import time
+import typing as tp
+
+import life
+import life_hashlife
+import life_numpy
+import life_parallel
+import life_sparse
+import life_swar
+
+ENGINES: tp.Dict[str, tp.Type[life.GameOfLife]] = {
+    "list": life.GameOfLife,
+    "numpy": life_numpy.NumpyGameOfLife,
+    "swar": life_swar.SwarGameOfLife,
+    "hashlife": life_hashlife.HashLifeGameOfLife,
+    "sparse": life_sparse.SparseGameOfLife,
+}
+
+# Списочный движок на больших полях считает поколение секундами
+SIZES = {
+    "list": [100, 250, 500],
+    "numpy": [100, 250, 500, 1000, 2000, 4000],
+    "swar": [100, 250, 500, 1000, 2000, 4000, 10000],
+    # HashLife выигрывает на повторяющихся узорах и step(n), а не на случайном поле
+    "hashlife": [100, 250, 500],
+    "sparse": [100, 250, 500, 1000, 2000],
+}
+
+
+def bench_engine(engine: str, size: int, generations: int = 10, density: tp.Optional[float] = None) -> float:
+    """
+    Скорость движка на случайном поле size x size в обновлениях клеток в
+    секунду. Если задана density, живой будет примерно такая доля клеток.
+    """
+    if density is None:
+        game = ENGINES[engine]((size, size), randomize=True)
+    else:
+        game = ENGINES[engine]((size, size), randomize=False)
+        game.curr_generation = [[int(random.random() < density) for _ in range(size)] for _ in range(size)]
+    start = time.perf_counter()
+    for _ in range(generations):
+        game.step()
+    return size * size * generations / (time.perf_counter() - start)
+
+
+def bench_scaling(size: int = 4096, generations: int = 20) -> tp.Dict[int, float]:
+    """
+    Скорость ParallelGameOfLife на поле size x size для 1, 2, 4, ... воркеров
+    (до числа ядер) в обновлениях клеток в секунду. Запуск воркеров и первый
+    шаг в замер не входят.
+    """
+    cores = os.cpu_count() or 1
+    result = {}
+    for workers in sorted({min(1 << i, cores) for i in range(cores.bit_length() + 1)}):
+        with life_parallel.ParallelGameOfLife((size, size), workers=workers) as game:
+            game.step()
+            start = time.perf_counter()
+            game.step(generations)
+            result[workers] = size * size * generations / (time.perf_counter() - start)
+    return result
+
+
+if __name__ == "__main__":
+    if sys.argv[1:2] == ["scaling"]:
+        SCALING = bench_scaling(*map(int, sys.argv[2:3]))
+        for WORKERS, SPEED in SCALING.items():
+            print(f"{WORKERS:>3} workers: {SPEED:.3e} cell updates/s, x{SPEED / SCALING[1]:.2f}")
+        sys.exit()
+    NAMES = sys.argv[1:] or list(ENGINES)
+    for ENGINE in NAMES:
+        for SIZE in SIZES.get(ENGINE, SIZES["numpy"]):
+            print(f"{ENGINE:>8} {SIZE:>5}x{SIZE:<5}: {bench_engine(ENGINE, SIZE):.3e} cell updates/s")
+            # Почти пустое поле: на нём sparse считает только клетки рядом с изменениями
+            print(f"{'':>8} {'5% live':>11}: {bench_engine(ENGINE, SIZE, density=0.05):.3e} cell updates/s")
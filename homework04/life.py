@@ -29,46 +29,65 @@ class GameOfLife:
         self.generations = 1
 
     def create_grid(self, randomize: bool = False) -> Grid:
-        # Copy from previous assignment
-        pass
+        if randomize:
+            return [[random.randint(0, 1) for _ in range(self.cols)] for _ in range(self.rows)]
+        return [[0] * self.cols for _ in range(self.rows)]
 
     def get_neighbours(self, cell: Cell) -> Cells:
-        # Copy from previous assignment
-        pass
+        row, col = cell
+        return [
+            self.curr_generation[r][c]
+            for r in range(max(row - 1, 0), min(row + 2, self.rows))
+            for c in range(max(col - 1, 0), min(col + 2, self.cols))
+            if (r, c) != cell
+        ]
 
     def get_next_generation(self) -> Grid:
-        # Copy from previous assignment
-        pass
+        return [
+            [
+                int(sum(self.get_neighbours((row, col))) in ((2, 3) if self.curr_generation[row][col] else (3,)))
+                for col in range(self.cols)
+            ]
+            for row in range(self.rows)
+        ]
 
     def step(self) -> None:
         """
         Выполнить один шаг игры.
         """
-        pass
+        # get_next_generation строит новое поле, старое можно не копировать
+        self.prev_generation = self.curr_generation
+        self.curr_generation = self.get_next_generation()
+        self.generations += 1
 
     @property
     def is_max_generations_exceeded(self) -> bool:
         """
         Не превысило ли текущее число поколений максимально допустимое.
         """
-        pass
+        return self.max_generations is not None and self.generations >= self.max_generations
 
     @property
     def is_changing(self) -> bool:
         """
         Изменилось ли состояние клеток с предыдущего шага.
         """
-        pass
+        return self.curr_generation != self.prev_generation
 
-    @staticmethod
-    def from_file(filename: pathlib.Path) -> "GameOfLife":
+    @classmethod
+    def from_file(cls, filename: pathlib.Path) -> "GameOfLife":
         """
         Прочитать состояние клеток из указанного файла.
         """
-        pass
+        lines = [line.strip() for line in pathlib.Path(filename).read_text().splitlines() if line.strip()]
+        game = cls((len(lines), len(lines[0])), randomize=False)
+        game.curr_generation = [[int(c) for c in line] for line in lines]
+        return game
 
     def save(self, filename: pathlib.Path) -> None:
         """
         Сохранить текущее состояние клеток в указанный файл.
         """
-        pass
+        with pathlib.Path(filename).open("w") as f:
+            for row in self.curr_generation:
+                f.write("".join(str(int(cell)) for cell in row) + "\n")
@@ -0,0 +1,313 @@
+import typing as tp
+
+import life
+
+
+class Node:
+    """
+    Узел квадродерева: квадрат 2^k x 2^k из четырёх квадрантов уровня k - 1.
+    Узлы уровня 0 - отдельные клетки. Одинаковые узлы существуют в одном
+    экземпляре (см. HashLifeGameOfLife._join), поэтому сравниваются по is.
+    """
+
+    __slots__ = ("k", "nw", "ne", "sw", "se", "population", "_hash")
+
+    def __init__(
+        self,
+        k: int,
+        nw: tp.Optional["Node"] = None,
+        ne: tp.Optional["Node"] = None,
+        sw: tp.Optional["Node"] = None,
+        se: tp.Optional["Node"] = None,
+        population: int = 0,
+    ) -> None:
+        self.k = k
+        self.nw, self.ne, self.sw, self.se = nw, ne, sw, se
+        self.population = population
+        self._hash = hash((k, id(nw), id(ne), id(sw), id(se), population))
+
+    def __hash__(self) -> int:
+        return self._hash
+
+
+OFF = Node(0)
+ON = Node(0, population=1)
+
+
+def _quadrants(node: Node) -> tp.Tuple[Node, Node, Node, Node]:
+    assert node.nw is not None and node.ne is not None and node.sw is not None and node.se is not None
+    return node.nw, node.ne, node.sw, node.se
+
+
+class HashLifeGameOfLife(life.GameOfLife):
+    """
+    Игра «Жизнь» алгоритмом HashLife на бесконечной плоскости.
+
+    Поле - квадродерево с общими одинаковыми поддеревьями, для каждого узла
+    запоминается его центр через 2^j поколений, так что повторяющиеся
+    участки считаются один раз. step(n) продвигает поле на n поколений
+    прыжками по степеням двойки; вселенная достраивается пустыми краями,
+    когда узор к ним подходит. В отличие от остальных движков за краем
+    окна rows x cols клетки не мертвы: curr_generation и prev_generation -
+    только вид на это окно, узор, ушедший за край, живёт дальше.
+
+    Кэш результатов и таблица узлов ограничены max_cache записями, в том
+    числе внутри одного step(n): при переполнении они сбрасываются целиком
+    и заполняются заново по мере надобности, cache_size и evictions
+    показывают их состояние.
+    """
+
+    def __init__(
+        self,
+        size: tp.Tuple[int, int],
+        randomize: bool = True,
+        max_generations: tp.Optional[float] = float("inf"),
+        max_cache: int = 1_000_000,
+    ) -> None:
+        self.max_cache = max_cache
+        self.evictions = 0
+        self._nodes: tp.Dict[tp.Tuple[Node, Node, Node, Node], Node] = {}
+        self._memo: tp.Dict[tp.Tuple[Node, int], Node] = {}
+        self._empty = [OFF]
+        # Корень и координаты его левого верхнего угла на плоскости
+        self._root = OFF
+        self._origin = (0, 0)
+        self._prev_root = OFF
+        self._prev_origin = (0, 0)
+        super().__init__(size, randomize, max_generations)
+
+    # Построение узлов
+
+    def _join(self, nw: Node, ne: Node, sw: Node, se: Node) -> Node:
+        key = (nw, ne, sw, se)
+        node = self._nodes.get(key)
+        if node is None:
+            population = nw.population + ne.population + sw.population + se.population
+            node = Node(nw.k + 1, nw, ne, sw, se, population)
+            self._nodes[key] = node
+            self._evict()
+        return node
+
+    def _empty_node(self, k: int) -> Node:
+        while len(self._empty) <= k:
+            e = self._empty[-1]
+            self._empty.append(self._join(e, e, e, e))
+        return self._empty[k]
+
+    def _centre(self, node: Node) -> Node:
+        # Узел уровня k + 1, в центре которого node
+        nw, ne, sw, se = _quadrants(node)
+        e = self._empty_node(node.k - 1)
+        return self._join(
+            self._join(e, e, e, nw), self._join(e, e, ne, e), self._join(e, sw, e, e), self._join(se, e, e, e)
+        )
+
+    def _centre_of(self, node: Node) -> Node:
+        # Центральный квадрат уровня k - 1
+        nw, ne, sw, se = _quadrants(node)
+        return self._join(_quadrants(nw)[3], _quadrants(ne)[2], _quadrants(sw)[1], _quadrants(se)[0])
+
+    @property
+    def cache_size(self) -> int:
+        """Число запомненных результатов и узлов"""
+        return len(self._memo) + len(self._nodes)
+
+    def _evict(self) -> None:
+        # Вызывается после каждой новой записи, так что предел держится и посреди
+        # одного большого шага. Узлы, на которые ещё ссылается рекурсия, остаются
+        # рабочими объектами, просто перестают быть единственными в своём роде.
+        # Пустые узлы возвращаются в таблицу, чтобы _empty оставался верным
+        if self.cache_size > self.max_cache:
+            self._memo.clear()
+            self._nodes.clear()
+            for e in self._empty[1:]:
+                self._nodes[_quadrants(e)] = e
+            self.evictions += 1
+
+    # Вычисление поколений
+
+    def _life_4x4(self, node: Node) -> Node:
+        # Центр 2 x 2 квадрата 4 x 4 через одно поколение
+        cells = [[0] * 4 for _ in range(4)]
+        for qi, quadrant in enumerate(_quadrants(node)):
+            for ci, cell in enumerate(_quadrants(quadrant)):
+                cells[2 * (qi // 2) + ci // 2][2 * (qi % 2) + ci % 2] = cell.population
+        result = []
+        for r, c in ((1, 1), (1, 2), (2, 1), (2, 2)):
+            alive = sum(cells[i][j] for i in range(r - 1, r + 2) for j in range(c - 1, c + 2)) - cells[r][c]
+            result.append(ON if alive == 3 or (alive == 2 and cells[r][c]) else OFF)
+        return self._join(*result)
+
+    def _successor(self, node: Node, j: int) -> Node:
+        """Центр узла уровня k через 2^j поколений, j <= k - 2"""
+        if node.population == 0:
+            return _quadrants(node)[0]
+        key = (node, j)
+        cached = self._memo.get(key)
+        if cached is not None:
+            return cached
+        if node.k == 2:
+            result = self._life_4x4(node)
+        else:
+            a, b, c, d = _quadrants(node)
+            a_nw, a_ne, a_sw, a_se = _quadrants(a)
+            b_nw, b_ne, b_sw, b_se = _quadrants(b)
+            c_nw, c_ne, c_sw, c_se = _quadrants(c)
+            d_nw, d_ne, d_sw, d_se = _quadrants(d)
+            # Девять перекрывающихся квадратов уровня k - 1
+            parts = [
+                self._successor(sub, j)
+                for sub in (
+                    a,
+                    self._join(a_ne, b_nw, a_se, b_sw),
+                    b,
+                    self._join(a_sw, a_se, c_nw, c_ne),
+                    self._join(a_se, b_sw, c_ne, d_nw),
+                    self._join(b_sw, b_se, d_nw, d_ne),
+                    c,
+                    self._join(c_ne, d_nw, c_se, d_sw),
+                    d,
+                )
+            ]
+            if j < node.k - 2:
+                # Достаточно половины прыжка: собираем центр из центров частей
+                p = [_quadrants(part) for part in parts]
+                result = self._join(
+                    self._join(p[0][3], p[1][2], p[3][1], p[4][0]),
+                    self._join(p[1][3], p[2][2], p[4][1], p[5][0]),
+                    self._join(p[3][3], p[4][2], p[6][1], p[7][0]),
+                    self._join(p[4][3], p[5][2], p[7][1], p[8][0]),
+                )
+            else:
+                result = self._join(
+                    self._successor(self._join(parts[0], parts[1], parts[3], parts[4]), j),
+                    self._successor(self._join(parts[1], parts[2], parts[4], parts[5]), j),
+                    self._successor(self._join(parts[3], parts[4], parts[6], parts[7]), j),
+                    self._successor(self._join(parts[4], parts[5], parts[7], parts[8]), j),
+                )
+        self._memo[key] = result
+        self._evict()
+        return result
+
+    def _crop(self, node: Node, origin: tp.Tuple[int, int]) -> tp.Tuple[Node, tp.Tuple[int, int]]:
+        # Отрезать пустые края, пока узор помещается в центр
+        while node.k > 2:
+            centre = self._centre_of(node)
+            if centre.population != node.population:
+                break
+            shift = 1 << (node.k - 2)
+            node, origin = centre, (origin[0] + shift, origin[1] + shift)
+        return node, origin
+
+    def _advance(self, node: Node, origin: tp.Tuple[int, int], j: int) -> tp.Tuple[Node, tp.Tuple[int, int]]:
+        # Продвинуть на 2^j поколений. Узор в node за это время уходит не дальше
+        # чем на 2^j клеток, поэтому его обкладывают пустотой шириной не меньше 2^j
+        while node.k < j + 1:
+            node, origin = self._centre(node), (origin[0] - (1 << (node.k - 1)), origin[1] - (1 << (node.k - 1)))
+        for _ in range(2):
+            node, origin = self._centre(node), (origin[0] - (1 << (node.k - 1)), origin[1] - (1 << (node.k - 1)))
+        shift = 1 << (node.k - 2)
+        return self._crop(self._successor(node, j), (origin[0] + shift, origin[1] + shift))
+
+    def step(self, n: int = 1) -> None:
+        """Выполнить n шагов игры, по степеням двойки"""
+        if n < 0:
+            raise ValueError("n must be non-negative")
+        self._prev_root, self._prev_origin = self._root, self._origin
+        node, origin = self._root, self._origin
+        j = 0
+        while n >> j:
+            if (n >> j) & 1:
+                node, origin = self._advance(node, origin, j)
+            j += 1
+        self._root, self._origin = node, origin
+        self.generations += n
+
+    def get_next_generation(self) -> life.Grid:
+        node, origin = self._advance(self._root, self._origin, 0)
+        return self._render(node, origin)
+
+    # Перевод между окном rows x cols и квадродеревом
+
+    def _build(self, grid: life.Grid) -> tp.Tuple[Node, tp.Tuple[int, int]]:
+        rows = len(grid)
+        cols = len(grid[0]) if rows else 0
+        k = 2
+        while (1 << k) < max(rows, cols):
+            k += 1
+
+        def build(r: int, c: int, level: int) -> Node:
+            if r >= rows or c >= cols:
+                return self._empty_node(level)
+            if level == 0:
+                return ON if grid[r][c] else OFF
+            half = 1 << (level - 1)
+            return self._join(
+                build(r, c, level - 1),
+                build(r, c + half, level - 1),
+                build(r + half, c, level - 1),
+                build(r + half, c + half, level - 1),
+            )
+
+        return self._crop(build(0, 0, k), (0, 0))
+
+    def _render(self, node: Node, origin: tp.Tuple[int, int]) -> life.Grid:
+        grid = [[0] * self.cols for _ in range(self.rows)]
+        stack = [(node, origin)]
+        while stack:
+            current, (r, c) = stack.pop()
+            size = 1 << current.k
+            if current.population == 0 or r >= self.rows or c >= self.cols or r + size <= 0 or c + size <= 0:
+                continue
+            if current.k == 0:
+                grid[r][c] = 1
+                continue
+            half = size >> 1
+            nw, ne, sw, se = _quadrants(current)
+            stack.extend([(nw, (r, c)), (ne, (r, c + half)), (sw, (r + half, c)), (se, (r + half, c + half))])
+        return grid
+
+    @property  # type: ignore[override]
+    def curr_generation(self) -> life.Grid:
+        return self._render(self._root, self._origin)
+
+    @curr_generation.setter
+    def curr_generation(self, grid: life.Grid) -> None:
+        self._root, self._origin = self._build(grid)
+
+    @property  # type: ignore[override]
+    def prev_generation(self) -> life.Grid:
+        return self._render(self._prev_root, self._prev_origin)
+
+    @prev_generation.setter
+    def prev_generation(self, grid: life.Grid) -> None:
+        self._prev_root, self._prev_origin = self._build(grid)
+
+    @property
+    def population(self) -> int:
+        """Число живых клеток на всей плоскости"""
+        return self._root.population
+
+    @property
+    def is_changing(self) -> bool:
+        return not self._same(self._root, self._origin, self._prev_root, self._prev_origin)
+
+    def _same(self, a: Node, a_origin: tp.Tuple[int, int], b: Node, b_origin: tp.Tuple[int, int]) -> bool:
+        # Оба корня обрезаны одинаково, так что равные узоры дают равные узлы и углы.
+        # После сброса кэша одинаковые узлы могут быть разными объектами, поэтому
+        # при несовпадении по is дерево сравнивается по содержимому
+        if a.population != b.population:
+            return False
+        if a.population == 0:
+            return True
+        if a_origin != b_origin or a.k != b.k:
+            return False
+        pending = [(a, b)]
+        while pending:
+            x, y = pending.pop()
+            if x is y:
+                continue
+            if x.population != y.population or x.k == 0:
+                return False
+            pending.extend(zip(_quadrants(x), _quadrants(y)))
+        return True
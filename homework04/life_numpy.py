@@ -0,0 +1,41 @@
+import random
+import typing as tp
+
+import life
+import numpy as np
+
+
+def next_generation(grid: np.ndarray) -> np.ndarray:
+    """
+    Следующее поколение для поля из нулей и единиц. За краем поля клетки
+    мёртвые, как в life.GameOfLife. Сумма 3 x 3 считается двумя проходами
+    сдвинутых срезов: сначала по строкам, потом по столбцам.
+    """
+    padded = np.pad(grid, 1)
+    rows = padded[:, :-2] + padded[:, 1:-1] + padded[:, 2:]
+    block = rows[:-2] + rows[1:-1] + rows[2:]
+    # В block входит и сама клетка: живая остаётся при 3 или 4, мёртвая оживает при 3
+    return ((block == 3) | ((block == 4) & (grid == 1))).astype(np.uint8)
+
+
+class NumpyGameOfLife(life.GameOfLife):
+    """
+    Игра «Жизнь», у которой curr_generation - массив uint8 формы (rows, cols).
+    Поле, заданное списком списков, приводится к массиву на следующем шаге.
+    """
+
+    curr_generation: tp.Any
+    prev_generation: tp.Any
+
+    def create_grid(self, randomize: bool = False) -> tp.Any:
+        if randomize:
+            cells = np.frombuffer(random.randbytes(self.rows * self.cols), dtype=np.uint8) & 1
+            return cells.reshape(self.rows, self.cols)
+        return np.zeros((self.rows, self.cols), dtype=np.uint8)
+
+    def get_next_generation(self) -> tp.Any:
+        return next_generation(np.asarray(self.curr_generation, dtype=np.uint8))
+
+    @property
+    def is_changing(self) -> bool:
+        return not np.array_equal(self.curr_generation, self.prev_generation)
@@ -0,0 +1,152 @@
+import multiprocessing as mp
+import os
+import typing as tp
+from multiprocessing import shared_memory
+from multiprocessing.synchronize import Barrier
+
+import life_numpy
+import numpy as np
+
+
+def next_strip(grid: np.ndarray, start: int, stop: int, out: np.ndarray, ext: np.ndarray) -> None:
+    """
+    Записать в out[start:stop] следующее поколение строк start..stop-1 поля
+    grid. Соседние строки start - 1 и stop (гало) читаются прямо из grid,
+    ext - рабочий массив uint8 формы (stop - start + 2, cols + 2), его края
+    по столбцам должны быть нулевыми.
+    """
+    rows = grid.shape[0]
+    ext[0, 1:-1] = grid[start - 1] if start > 0 else 0
+    ext[1:-1, 1:-1] = grid[start:stop]
+    ext[-1, 1:-1] = grid[stop] if stop < rows else 0
+    sums = ext[:, :-2] + ext[:, 1:-1] + ext[:, 2:]
+    block = sums[:-2] + sums[1:-1] + sums[2:]
+    # Те же правила, что в life_numpy.next_generation
+    out[start:stop] = (block == 3) | ((block == 4) & (grid[start:stop] == 1))
+
+
+def _strip_worker(
+    name: str, shape: tp.Tuple[int, int], start: int, stop: int, gate: Barrier, sync: Barrier, command: tp.Any
+) -> None:
+    # Воркер живёт всё время игры: ждёт команду у gate, считает command[0]
+    # поколений своей полосы, сверяясь с остальными у sync после каждого
+    block = shared_memory.SharedMemory(name)
+    try:
+        buffers = np.ndarray((2,) + shape, dtype=np.uint8, buffer=block.buf)
+        ext = np.zeros((stop - start + 2, shape[1] + 2), dtype=np.uint8)
+        while True:
+            gate.wait()
+            generations, current = command[0], command[1]
+            if generations < 0:
+                break
+            for g in range(generations):
+                src = (current + g) % 2
+                next_strip(buffers[src], start, stop, buffers[1 - src], ext)
+                sync.wait()
+            gate.wait()
+        del buffers
+    finally:
+        block.close()
+
+
+class ParallelGameOfLife(life_numpy.NumpyGameOfLife):
+    """
+    Игра «Жизнь» на нескольких ядрах. Оба поколения лежат в одном блоке
+    multiprocessing.shared_memory, поле разбито на горизонтальные полосы
+    по числу воркеров. Воркеры запускаются при первом шаге и живут до
+    close(): каждый считает свою полосу, читая по строке гало у соседей
+    прямо из общего блока, и пишет в буфер предыдущего поколения, после
+    чего буферы просто меняются ролями, без копирования.
+
+    curr_generation и prev_generation - массивы uint8 в общем блоке;
+    присваивание копирует поле в блок. Игру нужно закрыть через close()
+    или with, иначе процессы и блок останутся до выхода из программы.
+    """
+
+    def __init__(
+        self,
+        size: tp.Tuple[int, int],
+        randomize: bool = True,
+        max_generations: tp.Optional[float] = float("inf"),
+        workers: tp.Optional[int] = None,
+    ) -> None:
+        rows, cols = size
+        self.workers = max(1, min(workers or os.cpu_count() or 1, rows))
+        block = shared_memory.SharedMemory(create=True, size=max(1, 2 * rows * cols))
+        self._block: tp.Optional[shared_memory.SharedMemory] = block
+        self._buffers = np.ndarray((2, rows, cols), dtype=np.uint8, buffer=block.buf)
+        self._current = 0
+        self._processes: tp.List[mp.Process] = []
+        super().__init__(size, randomize, max_generations)
+
+    @property  # type: ignore[override]
+    def curr_generation(self) -> np.ndarray:
+        return self._buffers[self._current]
+
+    @curr_generation.setter
+    def curr_generation(self, grid: tp.Any) -> None:
+        self._buffers[self._current] = grid
+
+    @property  # type: ignore[override]
+    def prev_generation(self) -> np.ndarray:
+        return self._buffers[1 - self._current]
+
+    @prev_generation.setter
+    def prev_generation(self, grid: tp.Any) -> None:
+        self._buffers[1 - self._current] = grid
+
+    def _start(self) -> None:
+        if self._block is None:
+            raise ValueError("game is closed")
+        self._gate = mp.Barrier(self.workers + 1)
+        self._sync = mp.Barrier(self.workers)
+        self._command = mp.Array("q", 2, lock=False)
+        bounds = np.linspace(0, self.rows, self.workers + 1).astype(int)
+        for start, stop in zip(bounds[:-1], bounds[1:]):
+            process = mp.Process(
+                target=_strip_worker,
+                args=(
+                    self._block.name,
+                    (self.rows, self.cols),
+                    int(start),
+                    int(stop),
+                    self._gate,
+                    self._sync,
+                    self._command,
+                ),
+                daemon=True,
+            )
+            process.start()
+            self._processes.append(process)
+
+    def step(self, n: int = 1) -> None:
+        """Выполнить n шагов игры; между шагами воркеры ждут только друг друга"""
+        if n <= 0:
+            return
+        if not self._processes:
+            self._start()
+        self._command[0], self._command[1] = n, self._current
+        self._gate.wait()
+        self._gate.wait()
+        self._current = (self._current + n) % 2
+        self.generations += n
+
+    def close(self) -> None:
+        """Остановить воркеров и освободить общий блок; поля остаются доступны для чтения"""
+        if self._processes:
+            self._command[0] = -1
+            self._gate.wait()
+            for process in self._processes:
+                process.join()
+            self._processes = []
+        if self._block is not None:
+            self._buffers = self._buffers.copy()
+            self._block.close()
+            self._block.unlink()
+            self._block = None
+
+    def __enter__(self) -> "ParallelGameOfLife":
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        self.close()
@@ -29,6 +29,9 @@ class GameOfLife:
         # Скорость протекания игры
         self.speed = speed
 
+        # Текущее поколение клеток
+        self.grid = self.create_grid()
+
     def draw_lines(self) -> None:
         """ Отрисовать сетку """
         for x in range(0, self.width, self.cell_size):
@@ -44,7 +47,7 @@ class GameOfLife:
         self.screen.fill(pygame.Color("white"))
 
         # Создание списка клеток
-        # PUT YOUR CODE HERE
+        self.grid = self.create_grid(randomize=True)
 
         running = True
         while running:
@@ -55,7 +58,9 @@ class GameOfLife:
 
             # Отрисовка списка клеток
             # Выполнение одного шага игры (обновление состояния ячеек)
-            # PUT YOUR CODE HERE
+            self.draw_grid()
+            self.draw_lines()
+            self.grid = self.get_next_generation()
 
             pygame.display.flip()
             clock.tick(self.speed)
@@ -79,13 +84,19 @@ class GameOfLife:
         out : Grid
             Матрица клеток размером `cell_height` х `cell_width`.
         """
-        pass
+        if randomize:
+            return [[random.randint(0, 1) for _ in range(self.cell_width)] for _ in range(self.cell_height)]
+        return [[0] * self.cell_width for _ in range(self.cell_height)]
 
     def draw_grid(self) -> None:
         """
         Отрисовка списка клеток с закрашиванием их в соответствующе цвета.
         """
-        pass
+        for row, cells in enumerate(self.grid):
+            for col, alive in enumerate(cells):
+                color = pygame.Color("green") if alive else pygame.Color("white")
+                rect = (col * self.cell_size, row * self.cell_size, self.cell_size, self.cell_size)
+                pygame.draw.rect(self.screen, color, rect)
 
     def get_neighbours(self, cell: Cell) -> Cells:
         """
@@ -105,7 +116,13 @@ class GameOfLife:
         out : Cells
             Список соседних клеток.
         """
-        pass
+        row, col = cell
+        return [
+            self.grid[r][c]
+            for r in range(max(row - 1, 0), min(row + 2, self.cell_height))
+            for c in range(max(col - 1, 0), min(col + 2, self.cell_width))
+            if (r, c) != cell
+        ]
 
     def get_next_generation(self) -> Grid:
         """
@@ -116,4 +133,10 @@ class GameOfLife:
         out : Grid
             Новое поколение клеток.
         """
-        pass
+        return [
+            [
+                int(sum(self.get_neighbours((row, col))) in ((2, 3) if self.grid[row][col] else (3,)))
+                for col in range(self.cell_width)
+            ]
+            for row in range(self.cell_height)
+        ]
@@ -0,0 +1,129 @@
+import typing as tp
+
+import life
+
+# Сторона квадрата клеток, по которым считается tiles_touched
+TILE = 32
+
+
+class SparseGameOfLife(life.GameOfLife):
+    """
+    Игра «Жизнь» для почти пустых полей. Хранятся только живые клетки
+    (номера row * cols + col) и число живых соседей у клеток рядом с ними.
+    Шаг пересчитывает лишь клетки, которые изменились на прошлом шаге, и их
+    соседей, так что время шага зависит от числа изменений, а не от
+    размера поля. За краем поля клетки мёртвые, как в life.GameOfLife.
+
+    После шага changes - число изменившихся клеток, is_changing по нему
+    отвечает за O(1), tiles_touched - сколько квадратов TILE x TILE
+    пришлось пересчитать.
+    """
+
+    def __init__(
+        self,
+        size: tp.Tuple[int, int],
+        randomize: bool = True,
+        max_generations: tp.Optional[float] = float("inf"),
+    ) -> None:
+        self.live: tp.Set[int] = set()
+        self._counts: tp.Dict[int, int] = {}
+        # Клетки, которыми текущее поколение отличается от предыдущего
+        self._flipped: tp.Set[int] = set()
+        # Клетки, изменившиеся с последнего пересчёта
+        self._dirty: tp.Set[int] = set()
+        self.changes = 0
+        self.tiles_touched = 0
+        super().__init__(size, randomize, max_generations)
+
+    def _neighbours(self, cell: int) -> tp.List[int]:
+        row, col = divmod(cell, self.cols)
+        return [
+            r * self.cols + c
+            for r in range(max(row - 1, 0), min(row + 2, self.rows))
+            for c in range(max(col - 1, 0), min(col + 2, self.cols))
+            if (r, c) != (row, col)
+        ]
+
+    def _toggle(self, cell: int) -> None:
+        if cell in self.live:
+            self.live.remove(cell)
+            delta = -1
+        else:
+            self.live.add(cell)
+            delta = 1
+        counts = self._counts
+        for n in self._neighbours(cell):
+            count = counts.get(n, 0) + delta
+            if count:
+                counts[n] = count
+            else:
+                del counts[n]
+
+    def _flips(self) -> tp.Set[int]:
+        # Клетки, которые изменятся на следующем шаге
+        candidates = set(self._dirty)
+        for cell in self._dirty:
+            candidates.update(self._neighbours(cell))
+        self.tiles_touched = len({(c // self.cols // TILE, c % self.cols // TILE) for c in candidates})
+        live, counts = self.live, self._counts
+        flips = set()
+        for cell in candidates:
+            count = counts.get(cell, 0)
+            if cell in live:
+                if count not in (2, 3):
+                    flips.add(cell)
+            elif count == 3:
+                flips.add(cell)
+        return flips
+
+    def _cells(self, grid: life.Grid) -> tp.Set[int]:
+        return {r * self.cols + c for r, row in enumerate(grid) for c, cell in enumerate(row) if cell}
+
+    def _render(self, cells: tp.Set[int]) -> life.Grid:
+        grid = [[0] * self.cols for _ in range(self.rows)]
+        for cell in cells:
+            row, col = divmod(cell, self.cols)
+            grid[row][col] = 1
+        return grid
+
+    @property  # type: ignore[override]
+    def curr_generation(self) -> life.Grid:
+        return self._render(self.live)
+
+    @curr_generation.setter
+    def curr_generation(self, grid: life.Grid) -> None:
+        prev = self.live ^ self._flipped
+        diff = self.live ^ self._cells(grid)
+        for cell in diff:
+            self._toggle(cell)
+        self._dirty |= diff
+        self._flipped = self.live ^ prev
+        self.changes = len(self._flipped)
+
+    @property  # type: ignore[override]
+    def prev_generation(self) -> life.Grid:
+        return self._render(self.live ^ self._flipped)
+
+    @prev_generation.setter
+    def prev_generation(self, grid: life.Grid) -> None:
+        self._flipped = self.live ^ self._cells(grid)
+        self.changes = len(self._flipped)
+
+    def get_neighbours(self, cell: life.Cell) -> life.Cells:
+        row, col = cell
+        return [int(n in self.live) for n in self._neighbours(row * self.cols + col)]
+
+    def get_next_generation(self) -> life.Grid:
+        return self._render(self.live ^ self._flips())
+
+    def step(self) -> None:
+        flips = self._flips()
+        for cell in flips:
+            self._toggle(cell)
+        self._flipped, self._dirty = flips, set(flips)
+        self.changes = len(flips)
+        self.generations += 1
+
+    @property
+    def is_changing(self) -> bool:
+        return self.changes > 0
@@ -0,0 +1,156 @@
+import pathlib
+import random
+import typing as tp
+
+import life
+import numpy as np
+
+WORD = 64
+# Сколько строк поля обрабатывается за раз: временные массивы занимают band x words слов
+BAND = 1024
+
+_ONE = np.uint64(1)
+_TOP = np.uint64(WORD - 1)
+
+
+def words_per_row(cols: int) -> int:
+    return (cols + WORD - 1) // WORD
+
+
+def _last_mask(cols: int) -> np.uint64:
+    # Биты последнего слова строки, которые соответствуют клеткам поля
+    tail = cols % WORD
+    return np.uint64((1 << tail) - 1 if tail else (1 << WORD) - 1)
+
+
+def pack(grid: tp.Any) -> np.ndarray:
+    """
+    Упаковать поле из нулей и единиц в массив uint64 формы (rows, words):
+    клетка (r, c) - бит c % 64 слова c // 64 строки r.
+    """
+    cells = np.asarray(grid, dtype=np.uint8)
+    rows, cols = cells.shape
+    packed = np.packbits(cells, axis=1, bitorder="little")
+    padded = np.zeros((rows, words_per_row(cols) * 8), dtype=np.uint8)
+    padded[:, : packed.shape[1]] = packed
+    return padded.view("<u8").astype(np.uint64, copy=False)
+
+
+def unpack(words: np.ndarray, cols: int) -> np.ndarray:
+    """Распаковать массив pack обратно в поле uint8 формы (rows, cols)"""
+    as_bytes = np.ascontiguousarray(words, dtype="<u8").view(np.uint8)
+    return np.unpackbits(as_bytes, axis=1, bitorder="little")[:, :cols]
+
+
+def _row_sums(x: np.ndarray) -> tp.Tuple[np.ndarray, np.ndarray]:
+    # Сумма клетки и двух её соседей по строке двумя битовыми плоскостями (s1, s0)
+    west = x << _ONE
+    west[:, 1:] |= x[:, :-1] >> _TOP
+    east = x >> _ONE
+    east[:, :-1] |= x[:, 1:] << _TOP
+    half = west ^ x
+    return (west & x) | (east & half), half ^ east
+
+
+def next_words(words: np.ndarray, cols: int, out: tp.Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Следующее поколение упакованного поля. Каждое слово обрабатывает 64
+    клетки сразу: суммы строк по три клетки складываются сумматорами по
+    битовым плоскостям в число живых клеток блока 3 x 3 (от 0 до 9).
+    За краем поля клетки мёртвые.
+    """
+    rows, width = words.shape
+    if out is None:
+        out = np.empty_like(words)
+    mask = _last_mask(cols)
+    for start in range(0, rows, BAND):
+        stop = min(start + BAND, rows)
+        ext = np.zeros((stop - start + 2, width), dtype=np.uint64)
+        ext[1:-1] = words[start:stop]
+        if start > 0:
+            ext[0] = words[start - 1]
+        if stop < rows:
+            ext[-1] = words[stop]
+        s1, s0 = _row_sums(ext)
+        u0, m0, d0 = s0[:-2], s0[1:-1], s0[2:]
+        u1, m1, d1 = s1[:-2], s1[1:-1], s1[2:]
+        # Младший разряд: полный сумматор трёх бит
+        z0 = u0 ^ m0 ^ d0
+        c0 = (u0 & m0) | (d0 & (u0 ^ m0))
+        # Разряд двоек: три бита и перенос
+        p = u1 ^ m1 ^ d1
+        q = (u1 & m1) | (d1 & (u1 ^ m1))
+        y1 = p ^ c0
+        r = p & c0
+        y2 = q ^ r
+        y3 = q & r
+        # В блоке 3 (рождение или выживание) или 4 при живой клетке в центре
+        block = out[start:stop]
+        np.bitwise_and(z0 & y1 & ~y2 | ~z0 & ~y1 & y2 & words[start:stop], ~y3, out=block)
+        block[:, -1] &= mask
+    return out
+
+
+class SwarGameOfLife(life.GameOfLife):
+    """
+    Игра «Жизнь» на упакованном поле: curr_generation и prev_generation -
+    массивы uint64 из pack, по биту на клетку. Поле 100000 x 100000 занимает
+    1.25 ГБ, ещё столько же - предыдущее поколение, в которое пишется
+    следующее. Поле, заданное списком списков, упаковывается при первом шаге.
+    """
+
+    curr_generation: tp.Any
+    prev_generation: tp.Any
+
+    def _words(self, grid: tp.Any) -> np.ndarray:
+        if isinstance(grid, np.ndarray) and grid.dtype == np.uint64:
+            return grid
+        return pack(grid)
+
+    def create_grid(self, randomize: bool = False) -> tp.Any:
+        width = words_per_row(self.cols)
+        if not randomize:
+            return np.zeros((self.rows, width), dtype=np.uint64)
+        words = np.frombuffer(bytearray(random.randbytes(self.rows * width * 8)), dtype="<u8")
+        words = words.astype(np.uint64, copy=False).reshape(self.rows, width)
+        words[:, -1] &= _last_mask(self.cols)
+        return words
+
+    def get_neighbours(self, cell: life.Cell) -> life.Cells:
+        words = self._words(self.curr_generation)
+        row, col = cell
+        return [
+            int(words[r, c // WORD] >> np.uint64(c % WORD)) & 1
+            for r in range(max(row - 1, 0), min(row + 2, self.rows))
+            for c in range(max(col - 1, 0), min(col + 2, self.cols))
+            if (r, c) != cell
+        ]
+
+    def get_next_generation(self) -> tp.Any:
+        return next_words(self._words(self.curr_generation), self.cols)
+
+    def step(self) -> None:
+        curr = self._words(self.curr_generation)
+        prev = self._words(self.prev_generation)
+        # Новое поколение пишется поверх позапрошлого, лишней памяти не нужно
+        if prev is curr or prev.shape != curr.shape:
+            prev = np.empty_like(curr)
+        self.curr_generation = next_words(curr, self.cols, out=prev)
+        self.prev_generation = curr
+        self.generations += 1
+
+    @property
+    def is_changing(self) -> bool:
+        return not np.array_equal(self._words(self.curr_generation), self._words(self.prev_generation))
+
+    def to_array(self) -> np.ndarray:
+        """Текущее поколение полем uint8 формы (rows, cols)"""
+        return unpack(self._words(self.curr_generation), self.cols)
+
+    def save(self, filename: pathlib.Path) -> None:
+        words = self._words(self.curr_generation)
+        with pathlib.Path(filename).open("wb") as f:
+            for start in range(0, self.rows, BAND):
+                cells = unpack(words[start : start + BAND], self.cols) + ord("0")
+                newline = np.full((cells.shape[0], 1), ord("\n"), dtype=np.uint8)
+                f.write(np.hstack([cells, newline]).tobytes())
@@ -0,0 +1,87 @@
+import random
+import unittest
+
+import life
+import life_hashlife
+
+
+class TestHashLifeGameOfLife(unittest.TestCase):
+    def setUp(self):
+        # Узор в середине пустого поля: пока он не дошёл до края, ограниченное
+        # поле и бесконечная плоскость дают одно и то же
+        random.seed(11)
+        self.grid = [[0] * 60 for _ in range(60)]
+        for row in range(25, 35):
+            for col in range(25, 35):
+                self.grid[row][col] = random.randint(0, 1)
+
+    def test_matches_list_engine(self):
+        expected = life.GameOfLife((60, 60), randomize=False)
+        expected.curr_generation = self.grid
+        game = life_hashlife.HashLifeGameOfLife((60, 60), randomize=False)
+        game.curr_generation = self.grid
+        for _ in range(12):
+            expected.step()
+            game.step()
+            self.assertEqual(expected.curr_generation, game.curr_generation)
+            self.assertEqual(expected.is_changing, game.is_changing)
+
+    def test_step_n(self):
+        game = life_hashlife.HashLifeGameOfLife((60, 60), randomize=False)
+        game.curr_generation = self.grid
+        for _ in range(10):
+            game.step()
+        jumped = life_hashlife.HashLifeGameOfLife((60, 60), randomize=False)
+        jumped.curr_generation = self.grid
+        jumped.step(3)
+        jumped.step(7)
+        self.assertEqual(game.curr_generation, jumped.curr_generation)
+        self.assertEqual(11, jumped.generations)
+        self.assertRaises(ValueError, jumped.step, -1)
+        self.assertEqual(11, jumped.generations)
+
+    def test_glider_far_away(self):
+        game = life_hashlife.HashLifeGameOfLife((10, 10), randomize=False)
+        glider = [[0, 1, 0], [0, 0, 1], [1, 1, 1]]
+        game.curr_generation = glider
+        # Глайдер каждые 4 поколения сдвигается на клетку по диагонали
+        game.step(4)
+        self.assertEqual(glider, [row[1:4] for row in game.curr_generation[1:4]])
+        game.step(4 * 10**9)
+        self.assertEqual(5, game.population)
+        self.assertEqual(0, sum(map(sum, game.curr_generation)))
+        self.assertTrue(game.is_changing)
+
+    def test_cache_limit(self):
+        game = life_hashlife.HashLifeGameOfLife((60, 60), randomize=False, max_cache=500)
+        game.curr_generation = self.grid
+        expected = life_hashlife.HashLifeGameOfLife((60, 60), randomize=False)
+        expected.curr_generation = self.grid
+        for _ in range(5):
+            game.step(16)
+            expected.step(16)
+            self.assertLessEqual(game.cache_size, 500)
+            self.assertEqual(expected.curr_generation, game.curr_generation)
+        self.assertGreater(game.evictions, 0)
+        self.assertGreater(expected.cache_size, 500)
+
+    def test_cache_limit_within_step(self):
+        class Peak(life_hashlife.HashLifeGameOfLife):
+            peak = 0
+
+            def _evict(self):
+                super()._evict()
+                self.peak = max(self.peak, self.cache_size)
+
+        game = Peak((60, 60), randomize=False, max_cache=2000)
+        game.curr_generation = self.grid
+        expected = life_hashlife.HashLifeGameOfLife((60, 60), randomize=False)
+        expected.curr_generation = self.grid
+        # Один прыжок на 1024 поколения: кэш переполняется посреди рекурсии
+        game.step(1024)
+        expected.step(1024)
+        self.assertGreater(expected.cache_size, 2000)
+        self.assertGreater(game.evictions, 0)
+        self.assertLessEqual(game.peak, 2000)
+        self.assertEqual(expected.population, game.population)
+        self.assertEqual(expected.curr_generation, game.curr_generation)
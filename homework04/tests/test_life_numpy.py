@@ -0,0 +1,59 @@
+import json
+import os
+import random
+import unittest
+
+import life
+import life_numpy
+import numpy as np
+
+
+class TestNumpyGameOfLife(unittest.TestCase):
+    def setUp(self):
+        self.grid = [
+            [1, 1, 0, 0, 1, 1, 1, 1],
+            [0, 1, 1, 1, 1, 1, 1, 0],
+            [1, 0, 1, 1, 0, 0, 0, 0],
+            [1, 0, 0, 0, 0, 0, 0, 1],
+            [1, 0, 1, 1, 1, 1, 0, 0],
+            [1, 1, 1, 1, 0, 1, 1, 1],
+        ]
+
+    def test_create_grid(self):
+        game = life_numpy.NumpyGameOfLife((3, 4), randomize=False)
+        self.assertEqual((3, 4), game.curr_generation.shape)
+        self.assertEqual(np.uint8, game.curr_generation.dtype)
+        random.seed(1)
+        grid = game.create_grid(randomize=True)
+        self.assertTrue(set(grid.ravel().tolist()) <= {0, 1})
+
+    def test_can_update(self):
+        game = life_numpy.NumpyGameOfLife((6, 8))
+        game.curr_generation = self.grid
+        with open(os.path.join(os.path.dirname(__file__), "steps.txt")) as f:
+            steps = json.load(f)
+        num_updates = 0
+        for step in sorted(steps.keys(), key=int):
+            with self.subTest(step=step):
+                for _ in range(int(step) - num_updates):
+                    game.curr_generation = game.get_next_generation()
+                    num_updates += 1
+                self.assertEqual(steps[step], game.curr_generation.tolist())
+
+    def test_matches_list_engine(self):
+        random.seed(7)
+        expected = life.GameOfLife((30, 41))
+        game = life_numpy.NumpyGameOfLife((30, 41), randomize=False)
+        game.curr_generation = expected.curr_generation
+        for _ in range(25):
+            expected.step()
+            game.step()
+            self.assertEqual(expected.curr_generation, game.curr_generation.tolist())
+            self.assertEqual(expected.is_changing, game.is_changing)
+
+    def test_is_not_changing(self):
+        game = life_numpy.NumpyGameOfLife((6, 8), max_generations=20)
+        game.curr_generation = self.grid
+        while not game.is_max_generations_exceeded:
+            game.step()
+        self.assertFalse(game.is_changing)
@@ -0,0 +1,36 @@
+import random
+import unittest
+
+import life_numpy
+import life_parallel
+import numpy as np
+
+
+class TestParallelGameOfLife(unittest.TestCase):
+    def test_matches_numpy_engine(self):
+        for rows, cols, workers in [(17, 23, 3), (40, 9, 4), (2, 5, 4)]:
+            random.seed(rows)
+            expected = life_numpy.NumpyGameOfLife((rows, cols))
+            with life_parallel.ParallelGameOfLife((rows, cols), randomize=False, workers=workers) as game:
+                game.curr_generation = expected.curr_generation
+                for _ in range(15):
+                    expected.step()
+                    game.step()
+                    np.testing.assert_array_equal(expected.curr_generation, game.curr_generation)
+                    np.testing.assert_array_equal(expected.prev_generation, game.prev_generation)
+                    self.assertEqual(expected.is_changing, game.is_changing)
+
+    def test_step_n(self):
+        random.seed(2)
+        expected = life_numpy.NumpyGameOfLife((30, 30))
+        game = life_parallel.ParallelGameOfLife((30, 30), randomize=False, workers=2)
+        game.curr_generation = expected.curr_generation
+        for _ in range(7):
+            expected.step()
+        game.step(7)
+        game.close()
+        # После close поле остаётся доступным
+        np.testing.assert_array_equal(expected.curr_generation, game.curr_generation)
+        self.assertEqual(expected.generations, game.generations)
+        with self.assertRaises(ValueError):
+            game.step()
@@ -0,0 +1,72 @@
+import json
+import os
+import random
+import unittest
+
+import life
+import life_sparse
+
+
+class TestSparseGameOfLife(unittest.TestCase):
+    def test_can_update(self):
+        game = life_sparse.SparseGameOfLife((6, 8))
+        with open(os.path.join(os.path.dirname(__file__), "steps.txt")) as f:
+            steps = json.load(f)
+        game.curr_generation = [
+            [1, 1, 0, 0, 1, 1, 1, 1],
+            [0, 1, 1, 1, 1, 1, 1, 0],
+            [1, 0, 1, 1, 0, 0, 0, 0],
+            [1, 0, 0, 0, 0, 0, 0, 1],
+            [1, 0, 1, 1, 1, 1, 0, 0],
+            [1, 1, 1, 1, 0, 1, 1, 1],
+        ]
+        self.assertEqual(4, sum(game.get_neighbours((2, 3))))
+        num_updates = 0
+        for step in sorted(steps.keys(), key=int):
+            with self.subTest(step=step):
+                for _ in range(int(step) - num_updates):
+                    game.step()
+                    num_updates += 1
+                self.assertEqual(steps[step], game.curr_generation)
+
+    def test_matches_list_engine(self):
+        random.seed(8)
+        expected = life.GameOfLife((17, 23))
+        game = life_sparse.SparseGameOfLife((17, 23), randomize=False)
+        game.curr_generation = expected.curr_generation
+        self.assertEqual(expected.is_changing, game.is_changing)
+        for _ in range(40):
+            self.assertEqual(expected.get_next_generation(), game.get_next_generation())
+            expected.step()
+            game.step()
+            self.assertEqual(expected.curr_generation, game.curr_generation)
+            self.assertEqual(expected.prev_generation, game.prev_generation)
+            self.assertEqual(expected.is_changing, game.is_changing)
+
+    def test_touches_only_active_tiles(self):
+        game = life_sparse.SparseGameOfLife((1000, 1000), randomize=False)
+        grid = game.create_grid()
+        # Глайдер и блок далеко друг от друга
+        for row, col in [(0, 1), (1, 2), (2, 0), (2, 1), (2, 2), (500, 500), (500, 501), (501, 500), (501, 501)]:
+            grid[row][col] = 1
+        game.curr_generation = grid
+        game.step()
+        self.assertEqual(2, game.tiles_touched)
+        for _ in range(8):
+            game.step()
+            self.assertTrue(game.is_changing)
+            self.assertEqual(1, game.tiles_touched)
+        self.assertEqual(9, len(game.live))
+
+    def test_still_life_stops_changing(self):
+        game = life_sparse.SparseGameOfLife((10, 10), randomize=False)
+        grid = game.create_grid()
+        for row, col in [(4, 4), (4, 5), (5, 4), (5, 5)]:
+            grid[row][col] = 1
+        game.curr_generation = grid
+        self.assertTrue(game.is_changing)
+        game.step()
+        self.assertFalse(game.is_changing)
+        self.assertEqual(0, game.changes)
+        game.step()
+        self.assertEqual(0, game.tiles_touched)
@@ -0,0 +1,60 @@
+import json
+import os
+import random
+import tempfile
+import unittest
+
+import life
+import life_swar
+
+
+class TestSwarGameOfLife(unittest.TestCase):
+    def test_pack_roundtrip(self):
+        random.seed(3)
+        grid = life.GameOfLife((5, 130)).curr_generation
+        words = life_swar.pack(grid)
+        self.assertEqual((5, 3), words.shape)
+        self.assertEqual(grid, life_swar.unpack(words, 130).tolist())
+
+    def test_can_update(self):
+        game = life_swar.SwarGameOfLife((6, 8))
+        with open(os.path.join(os.path.dirname(__file__), "steps.txt")) as f:
+            steps = json.load(f)
+        game.curr_generation = [
+            [1, 1, 0, 0, 1, 1, 1, 1],
+            [0, 1, 1, 1, 1, 1, 1, 0],
+            [1, 0, 1, 1, 0, 0, 0, 0],
+            [1, 0, 0, 0, 0, 0, 0, 1],
+            [1, 0, 1, 1, 1, 1, 0, 0],
+            [1, 1, 1, 1, 0, 1, 1, 1],
+        ]
+        self.assertEqual(4, sum(game.get_neighbours((2, 3))))
+        num_updates = 0
+        for step in sorted(steps.keys(), key=int):
+            with self.subTest(step=step):
+                for _ in range(int(step) - num_updates):
+                    game.step()
+                    num_updates += 1
+                self.assertEqual(steps[step], game.to_array().tolist())
+
+    def test_matches_list_engine_across_words(self):
+        for rows, cols in [(20, 64), (13, 150)]:
+            random.seed(rows)
+            expected = life.GameOfLife((rows, cols))
+            game = life_swar.SwarGameOfLife((rows, cols), randomize=False)
+            game.curr_generation = expected.curr_generation
+            for _ in range(20):
+                expected.step()
+                game.step()
+                self.assertEqual(expected.curr_generation, game.to_array().tolist())
+                self.assertEqual(expected.is_changing, game.is_changing)
+
+    def test_save(self):
+        random.seed(5)
+        game = life_swar.SwarGameOfLife((7, 70))
+        game.step()
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "grid.txt")
+            game.save(path)
+            loaded = life.GameOfLife.from_file(path)
+        self.assertEqual(game.to_array().tolist(), loaded.curr_generation)